@@ -42,7 +42,9 @@ CREATE TABLE transaction_log (
     completed_at TIMESTAMP NULL,
     
     INDEX idx_transaction (transaction_id),
-    INDEX idx_status (status),
     INDEX idx_target_node (target_node),
-    INDEX idx_pending_retries (status, retry_count, target_node)
+    -- pending entries for one target, already in replay (created_at) order
+    INDEX idx_pending_by_target (status, target_node, created_at),
+    -- newest-first log listing (GET /logs)
+    INDEX idx_created (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
\ No newline at end of file
@@ -1,7 +1,13 @@
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
-from db_manager import DatabaseManager
-from replication.replication_manager import ReplicationManager
+from werkzeug.http import http_date
+from datetime import date
+from decimal import Decimal
+import orjson
+from db_manager import DatabaseManager, ISOLATION_LEVELS
+from replication.replication_manager import ReplicationManager, DURABILITY_MODES, INSERT_DURABILITY_MODES
+from initialize_data import initialize_fragments_from_central, reset_and_reinitialize_database
 import logging
 import os
 
@@ -26,8 +32,33 @@ else:
     TEMPLATE_FOLDER = os.path.join(BASE_DIR, "pages")    # Jinja templates
     STATIC_FOLDER = os.path.join(BASE_DIR, "public")     # CSS/JS/fonts
 
+# ---------- JSON ----------
+def _json_default(obj):
+    """Types orjson doesn't encode itself, formatted as Flask's default provider does"""
+    if isinstance(obj, date):
+        return http_date(obj)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class ORJSONProvider(JSONProvider):
+    """
+    jsonify() backed by orjson.
+    
+    Output matches the default provider: sorted keys, and dates as HTTP dates
+    (the frontend parses those as UTC), so only the encoder changes.
+    """
+    options = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default, option=self.options).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 # ---------- Flask App ----------
 app = Flask(__name__, template_folder=TEMPLATE_FOLDER, static_folder=STATIC_FOLDER)
+app.json = ORJSONProvider(app)
 CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -39,7 +70,6 @@ replication_manager.recovery_handler.start_automatic_retry()
 logger.info("Application started with automatic replication retry enabled")
 
 # Initial fragment sync if flag is set
-from initialize_data import initialize_fragments_from_central
 if os.getenv('INITIALIZE_FRAGMENTS') == 'true':
     logger.info("Initialization flag detected, syncing fragments from central...")
     initialize_fragments_from_central(db_manager)
@@ -63,8 +93,6 @@ def health_check():
 @app.route('/initialize-fragments', methods=['POST'])
 def sync_fragments_from_central():
     """Manual trigger to sync fragments from central with preserved timestamps"""
-    from initialize_data import initialize_fragments_from_central
-    
     success = initialize_fragments_from_central(db_manager)
     
     return jsonify({
@@ -78,8 +106,6 @@ def reset_database():
     Complete database reset and reinitialization pipeline.
     WARNING: This deletes ALL data!
     """
-    from initialize_data import reset_and_reinitialize_database
-    
     try:
         results = reset_and_reinitialize_database(db_manager)
         
@@ -97,12 +123,29 @@ def reset_database():
 
 @app.route('/titles', methods=['GET'])
 def get_titles():
-    """Get titles with pagination"""
+    """
+    Get titles with pagination
+    Query params:
+    - page: page number (default 1)
+    - limit: results per page (default 20)
+    - type: title_type filter
+    - after_year, after_tconst: keyset cursor from the previous response's
+      next_cursor; when given, page is ignored and the next rows are returned
+    """
     page = int(request.args.get('page', 1))
     limit = int(request.args.get('limit', 20))
     title_type = request.args.get('type', None)
+    after_tconst = request.args.get('after_tconst', None)
+    # Absent after_year is a NULL-year cursor; a malformed one must not become one
+    after_year = request.args.get('after_year', None)
+    if after_year is not None:
+        try:
+            after_year = int(after_year)
+        except ValueError:
+            return jsonify({'error': f'Invalid after_year: {after_year}'}), 400
+    after = (after_year, after_tconst) if after_tconst else None
     
-    result = db_manager.get_titles(page, limit, title_type)
+    result = db_manager.get_titles(page, limit, title_type, after)
     return jsonify(clean_result(result))
 
 @app.route('/titles/search', methods=['GET'])
@@ -149,7 +192,10 @@ def get_title(tconst):
 def create_title():
     """Create new title"""
     data = request.json
-    result = replication_manager.insert_title(data)
+    durability_mode = request.args.get('durability', 'sync')
+    if durability_mode not in INSERT_DURABILITY_MODES:
+        return jsonify({'error': f'Invalid durability mode for insert: {durability_mode}'}), 400
+    result = replication_manager.insert_title(data, durability_mode)
     return jsonify(clean_result(result)), 201 if result['success'] else 500
 
 @app.route('/title/<tconst>', methods=['PUT'])
@@ -157,13 +203,21 @@ def update_title(tconst):
     """Update existing title"""
     data = request.json
     isolation_level = request.args.get('isolation', 'READ COMMITTED')
-    result = replication_manager.update_title(tconst, data, isolation_level)
+    if isolation_level not in ISOLATION_LEVELS:
+        return jsonify({'error': f'Invalid isolation level: {isolation_level}'}), 400
+    durability_mode = request.args.get('durability', 'sync')
+    if durability_mode not in DURABILITY_MODES:
+        return jsonify({'error': f'Invalid durability mode: {durability_mode}'}), 400
+    result = replication_manager.update_title(tconst, data, isolation_level, durability_mode)
     return jsonify(clean_result(result))
 
 @app.route('/title/<tconst>', methods=['DELETE'])
 def delete_title(tconst):
     """Delete title"""
-    result = replication_manager.delete_title(tconst)
+    durability_mode = request.args.get('durability', 'sync')
+    if durability_mode not in DURABILITY_MODES:
+        return jsonify({'error': f'Invalid durability mode: {durability_mode}'}), 400
+    result = replication_manager.delete_title(tconst, durability_mode)
     return jsonify(clean_result(result))
 
 # ==================== CONCURRENCY TEST CASES ====================
@@ -178,6 +232,8 @@ def test_concurrent_read():
     data = request.json
     tconst = data.get('tconst')
     isolation_level = data.get('isolation_level', 'READ COMMITTED')
+    if isolation_level not in ISOLATION_LEVELS:
+        return jsonify({'error': f'Invalid isolation level: {isolation_level}'}), 400
     
     result = replication_manager.test_concurrent_reads(tconst, isolation_level)
     return jsonify(clean_result(result))
@@ -197,6 +253,8 @@ def test_read_write_conflict():
     tconst = data.get('tconst')
     new_data = data.get('new_data', {})
     isolation_level = data.get('isolation_level', 'READ COMMITTED')
+    if isolation_level not in ISOLATION_LEVELS:
+        return jsonify({'error': f'Invalid isolation level: {isolation_level}'}), 400
     
     result = replication_manager.test_read_write_conflict(tconst, new_data, isolation_level)
     return jsonify(clean_result(result))
@@ -225,6 +283,9 @@ def test_concurrent_write():
     if not tconst:
         return jsonify({'error': 'tconst is required for concurrent write test'}), 400
     
+    if isolation_level not in ISOLATION_LEVELS:
+        return jsonify({'error': f'Invalid isolation level: {isolation_level}'}), 400
+    
     if len(updates_data) < 2:
         return jsonify({'error': 'Need at least 2 concurrent updates for Case #3'}), 400
     
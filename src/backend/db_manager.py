@@ -1,11 +1,68 @@
 import mysql.connector
 from mysql.connector import Error
+from mysql.connector.errors import PoolError
+from mysql.connector.pooling import MySQLConnectionPool
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 import logging
+import random
+import threading
 import time
 import os
+import re
 
 logger = logging.getLogger(__name__)
 
+# Isolation levels accepted by get_connection (interpolated into SQL, so whitelisted)
+ISOLATION_LEVELS = ('READ UNCOMMITTED', 'READ COMMITTED', 'REPEATABLE READ', 'SERIALIZABLE')
+
+# Isolation level every pooled session starts in (re-applied on reconnect)
+DEFAULT_ISOLATION_LEVEL = 'READ COMMITTED'
+
+def session_init_command(isolation_level=DEFAULT_ISOLATION_LEVEL):
+    """
+    Session setup sent with the connect handshake (init_command).
+    
+    Stats expiry 0 keeps the information_schema row estimates used by
+    check_all_nodes current.
+    """
+    if isolation_level not in ISOLATION_LEVELS:
+        raise ValueError(f"Invalid isolation level: {isolation_level}")
+    return (
+        f"SET SESSION transaction_isolation = '{isolation_level.replace(' ', '-')}', "
+        "SESSION information_schema_stats_expiry = 0"
+    )
+
+POOL_SIZE = 16
+
+# How long a cached COUNT(*) for the titles listing stays valid
+COUNT_CACHE_TTL = 60
+
+# Retry backoff: base * 2^attempt capped at max, with +/-50% jitter
+RETRY_BASE_DELAY = 0.1
+RETRY_MAX_DELAY = 5
+
+def backoff_delay(attempt, base=RETRY_BASE_DELAY, max_delay=RETRY_MAX_DELAY):
+    """Seconds to sleep before retry number attempt (0-based)"""
+    return min(max_delay, base * (2 ** attempt)) * (0.5 + random.random())
+
+# Explicit column list for point lookups: every column the API returns, and
+# a stable row shape if the table ever grows columns the frontend doesn't use
+TITLE_COLUMNS = 'tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated'
+
+# Point lookup run through a per-session prepared statement (see _select_title)
+TITLE_BY_ID_QUERY = f"SELECT {TITLE_COLUMNS} FROM titles WHERE tconst = %s"
+
+# Prepared statements kept per pooled session by _prepared_cursor (oldest closed past this)
+PREPARED_STMT_CACHE_SIZE = 64
+
+# get_title_by_id cache: hot titles skip the round-trip until the next titles write
+TITLE_CACHE_SIZE = 10000
+TITLE_CACHE_TTL = 60
+
+# Matches statements that change the titles table
+TITLES_WRITE_PATTERN = re.compile(r'^\s*(INSERT\s+INTO|UPDATE|DELETE\s+FROM)\s+titles\b', re.IGNORECASE)
+
 class DatabaseManager:
     def __init__(self):
         # Node configuration from environment variables (with defaults for local Docker)
@@ -29,6 +86,21 @@ class DatabaseManager:
         self.user = os.environ.get('DB_USER', 'root')
         self.password = os.environ.get('DB_PASSWORD', 'password123')
         
+        # One connection pool per node, opened while waiting for the nodes at startup
+        # (or lazily on first use if a pool has to be rebuilt)
+        self._pools = {}
+        self._pool_lock = threading.Lock()
+        
+        # (node_name, title_type) -> (total, cached_at)
+        self._count_cache = {}
+        
+        # tconst -> title row; TTLCache is not thread-safe, so guard it.
+        # The generation is bumped on every invalidation so a read that
+        # raced with a write never stores the pre-write row.
+        self._title_cache = TTLCache(maxsize=TITLE_CACHE_SIZE, ttl=TITLE_CACHE_TTL)
+        self._title_cache_lock = threading.Lock()
+        self._cache_generation = 0
+        
         logger.info(f"Database configuration:")
         logger.info(f"  Node1: {self.nodes['node1']['host']}:{self.nodes['node1']['port']}")
         logger.info(f"  Node2: {self.nodes['node2']['host']}:{self.nodes['node2']['port']}")
@@ -36,66 +108,173 @@ class DatabaseManager:
         
         self._wait_for_nodes()
     
-    def _wait_for_nodes(self, max_retries=30, delay=2):
-        """Wait for all database nodes to be ready"""
+    def _wait_for_nodes(self, max_retries=30):
+        """Wait for all database nodes to be ready (probed in parallel)"""
         logger.info("Waiting for database nodes to be ready...")
         
-        for node_name in self.nodes.keys():
-            retries = 0
-            while retries < max_retries:
-                try:
-                    conn = self._create_connection(node_name)
-                    if conn:
-                        conn.close()
-                        logger.info(f"✓ {node_name} is ready")
-                        break
-                except Exception as e:
-                    retries += 1
-                    if retries >= max_retries:
-                        logger.error(f"✗ {node_name} failed to connect after {max_retries} attempts")
-                        raise Exception(f"Could not connect to {node_name}")
-                    logger.warning(f"⟳ {node_name} not ready, retrying ({retries}/{max_retries})...")
-                    time.sleep(delay)
+        nodes = list(self.nodes.keys())
+        with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+            # list() re-raises the first node that never came up
+            list(executor.map(lambda node_name: self._wait_for_node(node_name, max_retries), nodes))
         
         logger.info("All database nodes are ready!")
     
-    def _create_connection(self, node_name):
-        """Create raw connection without isolation level setting"""
+    def _wait_for_node(self, node_name, max_retries):
+        """
+        Retry connecting to one node with exponential backoff.
+        
+        Readiness is checked by opening the node's pool, which connects all
+        POOL_SIZE sessions up front so no request (or concurrency test
+        worker) pays for the handshakes.
+        """
+        retries = 0
+        while retries < max_retries:
+            try:
+                self._get_pool(node_name)
+                logger.info(f"✓ {node_name} is ready")
+                return
+            except Exception as e:
+                retries += 1
+                if retries >= max_retries:
+                    logger.error(f"✗ {node_name} failed to connect after {max_retries} attempts")
+                    raise Exception(f"Could not connect to {node_name}")
+                logger.warning(f"⟳ {node_name} not ready, retrying ({retries}/{max_retries})...")
+                time.sleep(backoff_delay(retries - 1))
+    
+    def _create_connection(self, node_name, isolation_level=None, **options):
+        """
+        Create a dedicated (unpooled) connection.
+        
+        With isolation_level, the session is configured through init_command
+        during the connect handshake instead of a separate SET round-trip.
+        Extra keyword options are passed through to mysql.connector.connect().
+        """
         node = self.nodes[node_name]
+        if isolation_level:
+            options['init_command'] = session_init_command(isolation_level)
+        
         return mysql.connector.connect(
             host=node['host'],
             port=node['port'],
             database=node['db'],
             user=self.user,
             password=self.password,
-            connect_timeout=5
+            connect_timeout=5,
+            **options
         )
     
-    def get_connection(self, node_name, isolation_level='READ COMMITTED', retries=1):
-        """Get database connection with specified isolation level and retry logic"""
+    def _get_pool(self, node_name):
+        """Get (or lazily create) the connection pool for a node"""
+        pool = self._pools.get(node_name)
+        if pool is not None:
+            return pool
+        
+        with self._pool_lock:
+            pool = self._pools.get(node_name)
+            if pool is None:
+                node = self.nodes[node_name]
+                pool = MySQLConnectionPool(
+                    pool_name=f'{node_name}_pool',
+                    pool_size=POOL_SIZE,
+                    # Sessions are kept as-is on return; see _checkout_connection
+                    pool_reset_session=False,
+                    host=node['host'],
+                    port=node['port'],
+                    database=node['db'],
+                    user=self.user,
+                    password=self.password,
+                    connect_timeout=5,
+                    consume_results=True,
+                    # Single-statement reads need no BEGIN/COMMIT; multi-statement
+                    # work opts in with conn.start_transaction()
+                    autocommit=True,
+                    init_command=session_init_command()
+                )
+                self._pools[node_name] = pool
+                logger.info(f"Created connection pool for {node_name} (size {POOL_SIZE})")
+        return pool
+    
+    def _checkout_connection(self, node_name, isolation_level):
+        """
+        Take a connection from the node's pool.
+        
+        close() on the returned connection hands it back to the pool.
+        Falls back to a dedicated connection when the pool is exhausted.
+        """
+        try:
+            conn = self._get_pool(node_name).get_connection()
+        except PoolError:
+            logger.warning(f"Connection pool for {node_name} exhausted, opening dedicated connection")
+            return self._create_connection(node_name, isolation_level, autocommit=True)
+        
+        # Never hand out a connection with a transaction left open by its last user
+        if conn.in_transaction:
+            conn.rollback()
+        
+        self._set_session_isolation(conn, isolation_level)
+        return conn
+    
+    def _set_session_isolation(self, conn, isolation_level):
+        """
+        Put a pooled session at isolation_level, skipping the SET if it is already there.
+        
+        The level last set is remembered on the underlying connection, keyed by
+        connection id: a reconnect runs init_command again, which puts the new
+        session back at DEFAULT_ISOLATION_LEVEL.
+        """
+        cnx = getattr(conn, '_cnx', conn)
+        connection_id = cnx.connection_id
+        current = getattr(cnx, '_session_isolation', None)
+        current_level = current[1] if current and current[0] == connection_id else DEFAULT_ISOLATION_LEVEL
+        
+        if current_level != isolation_level:
+            cursor = conn.cursor()
+            cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
+            cursor.close()
+            cnx._session_isolation = (connection_id, isolation_level)
+    
+    def get_connection(self, node_name, isolation_level=DEFAULT_ISOLATION_LEVEL, retries=1):
+        """
+        Get database connection with specified isolation level and retry logic.
+        
+        Connections run in autocommit mode, so a lone SELECT is its own
+        transaction. Callers that need several statements to share one
+        transaction (and its isolation level) call conn.start_transaction().
+        """
+        if isolation_level not in ISOLATION_LEVELS:
+            raise ValueError(f"Invalid isolation level: {isolation_level}")
+        
         last_error = None
         
         for attempt in range(retries):
             try:
-                conn = self._create_connection(node_name)
-                
-                # Set isolation level
-                cursor = conn.cursor()
-                cursor.execute(f"SET SESSION TRANSACTION ISOLATION LEVEL {isolation_level}")
-                cursor.close()
-                
-                return conn
+                return self._checkout_connection(node_name, isolation_level)
                 
             except Error as e:
                 last_error = e
                 if attempt < retries - 1:
                     logger.warning(f"Connection attempt {attempt + 1} failed for {node_name}, retrying...")
-                    time.sleep(1)
+                    time.sleep(backoff_delay(attempt))
                 else:
                     logger.error(f"Error connecting to {node_name} after {retries} attempts: {e}")
         
         return None
     
+    def get_bulk_connection(self, node_name):
+        """
+        Get a dedicated connection that may send LOAD DATA LOCAL INFILE.
+        
+        Kept out of the pool so local-infile is only enabled where bulk
+        loads actually need it. Returns None if the node is unreachable.
+        """
+        try:
+            return self._create_connection(
+                node_name, DEFAULT_ISOLATION_LEVEL, allow_local_infile=True
+            )
+        except Error as e:
+            logger.error(f"Error opening bulk connection to {node_name}: {e}")
+            return None
+    
     def check_node(self, node_name):
         """Check if a specific node is online"""
         conn = self.get_connection(node_name)
@@ -112,70 +291,71 @@ class DatabaseManager:
         return False
     
     def check_all_nodes(self):
-        """Check health of all nodes"""
-        status = {}
-        for node_name in self.nodes.keys():
-            conn = self.get_connection(node_name)
-            if conn:
-                try:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute("SELECT COUNT(*) as count FROM titles")
-                    result = cursor.fetchone()
-                    status[node_name] = {
-                        'status': 'online',
-                        'healthy': True,
-                        'record_count': result['count']
-                    }
-                except Error as e:
-                    status[node_name] = {
-                        'status': 'online',
-                        'healthy': False,
-                        'error': str(e)
-                    }
-                finally:
-                    conn.close()
-            else:
-                status[node_name] = {'status': 'offline', 'healthy': False}
-        return status
+        """Check health of all nodes (probed in parallel)"""
+        with ThreadPoolExecutor(max_workers=len(self.nodes)) as executor:
+            return dict(executor.map(self._probe_node, self.nodes.keys()))
+    
+    def _probe_node(self, node_name):
+        """Helper: Health status of a single node as (node_name, status)"""
+        conn = self.get_connection(node_name)
+        if not conn:
+            return node_name, {'status': 'offline', 'healthy': False}
+        
+        try:
+            # InnoDB's row estimate is O(1); COUNT(*) would scan the whole table.
+            # Exact counts are available from get_node_counts().
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute("""
+                SELECT table_rows as count FROM information_schema.tables
+                WHERE table_schema = %s AND table_name = 'titles'
+            """, (self.nodes[node_name]['db'],))
+            result = cursor.fetchone()
+            
+            if not result:
+                return node_name, {
+                    'status': 'online',
+                    'healthy': False,
+                    'error': 'titles table not found'
+                }
+            
+            return node_name, {
+                'status': 'online',
+                'healthy': True,
+                'record_count': result['count'],
+                'record_count_estimated': True
+            }
+        except Error as e:
+            return node_name, {
+                'status': 'online',
+                'healthy': False,
+                'error': str(e)
+            }
+        finally:
+            conn.close()
     
-    def get_titles(self, page=1, limit=20, title_type=None):
-        """Get titles with pagination and automatic fallback"""
+    def get_titles(self, page=1, limit=20, title_type=None, after=None):
+        """
+        Get titles with pagination and automatic fallback.
+        
+        Pass after=(start_year, tconst) of the last row already shown to use
+        keyset pagination, which seeks through idx_year instead of scanning
+        and discarding OFFSET rows. page is still supported for jumping to
+        an arbitrary page. Responses include 'next_cursor' for the next call.
+        """
         offset = (page - 1) * limit
         conn = self.get_connection('node1')
         
         if conn:
             try:
                 cursor = conn.cursor(dictionary=True)
-                
-                if title_type:
-                    query = """
-                        SELECT * FROM titles 
-                        WHERE title_type = %s 
-                        ORDER BY start_year DESC 
-                        LIMIT %s OFFSET %s
-                    """
-                    cursor.execute(query, (title_type, limit, offset))
-                else:
-                    query = """
-                        SELECT * FROM titles 
-                        ORDER BY start_year DESC 
-                        LIMIT %s OFFSET %s
-                    """
-                    cursor.execute(query, (limit, offset))
-                
-                titles = cursor.fetchall()
-                
-                # Get total count
-                cursor.execute("SELECT COUNT(*) as total FROM titles" + 
-                            (" WHERE title_type = %s" if title_type else ""),
-                            (title_type,) if title_type else ())
-                total = cursor.fetchone()['total']
+                titles, total = self._fetch_titles_page(cursor, 'node1', title_type, limit, offset, after)
                 
                 return {
                     'data': titles,
                     'total': total,
                     'page': page,
                     'limit': limit,
+                    'next_cursor': self._next_cursor(titles, limit),
                     'source': 'node1'
                 }
             except Error as e:
@@ -187,13 +367,114 @@ class DatabaseManager:
         logger.info(f"Node1 unavailable, using fragment nodes as fallback")
         
         if title_type == 'movie':
-            return self._get_titles_from_node('node2', page, limit, title_type)
+            return self._get_titles_from_node('node2', page, limit, title_type, after)
         elif title_type:
-            return self._get_titles_from_node('node3', page, limit, title_type)
+            return self._get_titles_from_node('node3', page, limit, title_type, after)
+        else:
+            return self._combine_fragment_titles(page, limit, after)
+
+    def _fetch_titles_page(self, cursor, node_name, title_type, limit, offset, after=None):
+        """
+        Helper: Fetch one page of titles and the total match count.
+        
+        The total is served from a short-lived cache when possible. On a miss,
+        offset pages get it from a COUNT(*) OVER () window on the same query,
+        so a page costs one round-trip instead of two. Keyset pages (after is
+        set) only see rows past the cursor, so they count separately.
+        
+        Returns:
+            (titles, total)
+        """
+        conditions = []
+        params = []
+        
+        if title_type:
+            conditions.append("title_type = %s")
+            params.append(title_type)
+        
+        count_where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        count_params = tuple(params)
+        total = self._get_cached_count(node_name, title_type)
+        cached = total is not None
+        
+        if after:
+            after_year, after_tconst = after
+            # NULL years sort last under DESC, so they follow every dated row
+            if after_year is None:
+                conditions.append("(start_year IS NULL AND tconst < %s)")
+                params.append(after_tconst)
+            else:
+                conditions.append(
+                    "(start_year < %s OR (start_year = %s AND tconst < %s) OR start_year IS NULL)"
+                )
+                params.extend([after_year, after_year, after_tconst])
+            
+            query = f"""
+                SELECT * FROM titles
+                WHERE {' AND '.join(conditions)}
+                ORDER BY start_year DESC, tconst DESC
+                LIMIT %s
+            """
+            cursor.execute(query, tuple(params) + (limit,))
+            titles = cursor.fetchall()
+        elif total is not None:
+            query = f"""
+                SELECT * FROM titles
+                {count_where}
+                ORDER BY start_year DESC, tconst DESC
+                LIMIT %s OFFSET %s
+            """
+            cursor.execute(query, count_params + (limit, offset))
+            titles = cursor.fetchall()
         else:
-            return self._combine_fragment_titles(page, limit)
+            query = f"""
+                SELECT t.*, COUNT(*) OVER () AS total_count
+                FROM titles t
+                {count_where}
+                ORDER BY start_year DESC, tconst DESC
+                LIMIT %s OFFSET %s
+            """
+            cursor.execute(query, count_params + (limit, offset))
+            titles = cursor.fetchall()
+            
+            if titles:
+                total = titles[0]['total_count']
+                for title in titles:
+                    del title['total_count']
+            elif not offset:
+                total = 0
+        
+        if total is None:
+            # Keyset page, or past the last page with no row to carry the count
+            cursor.execute(f"SELECT COUNT(*) as total FROM titles {count_where}", count_params)
+            total = cursor.fetchone()['total']
+        
+        if not cached:
+            self._count_cache[(node_name, title_type)] = (total, time.time())
+        return titles, total
+
+    def _get_cached_count(self, node_name, title_type):
+        """Helper: Cached titles COUNT(*) for a listing, None if missing or expired"""
+        cached = self._count_cache.get((node_name, title_type))
+        if cached and time.time() - cached[1] < COUNT_CACHE_TTL:
+            return cached[0]
+        return None
+
+    def invalidate_caches(self):
+        """Drop cached title data; call after writing titles outside execute_query"""
+        self._count_cache.clear()
+        with self._title_cache_lock:
+            self._cache_generation += 1
+            self._title_cache.clear()
 
-    def _get_titles_from_node(self, node_name, page, limit, title_type=None):
+    def _next_cursor(self, titles, limit):
+        """Helper: Keyset cursor for the page after titles, None on the last page"""
+        if len(titles) < limit:
+            return None
+        last = titles[-1]
+        return {'after_year': last['start_year'], 'after_tconst': last['tconst']}
+
+    def _get_titles_from_node(self, node_name, page, limit, title_type=None, after=None):
         """Helper: Get titles from a specific node"""
         offset = (page - 1) * limit
         conn = self.get_connection(node_name)
@@ -209,35 +490,14 @@ class DatabaseManager:
         
         try:
             cursor = conn.cursor(dictionary=True)
-            
-            if title_type:
-                query = """
-                    SELECT * FROM titles 
-                    WHERE title_type = %s 
-                    ORDER BY start_year DESC 
-                    LIMIT %s OFFSET %s
-                """
-                cursor.execute(query, (title_type, limit, offset))
-            else:
-                query = """
-                    SELECT * FROM titles 
-                    ORDER BY start_year DESC 
-                    LIMIT %s OFFSET %s
-                """
-                cursor.execute(query, (limit, offset))
-            
-            titles = cursor.fetchall()
-            
-            cursor.execute("SELECT COUNT(*) as total FROM titles" + 
-                        (" WHERE title_type = %s" if title_type else ""),
-                        (title_type,) if title_type else ())
-            total = cursor.fetchone()['total']
+            titles, total = self._fetch_titles_page(cursor, node_name, title_type, limit, offset, after)
             
             return {
                 'data': titles,
                 'total': total,
                 'page': page,
                 'limit': limit,
+                'next_cursor': self._next_cursor(titles, limit),
                 'source': node_name
             }
         except Error as e:
@@ -252,40 +512,33 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def _combine_fragment_titles(self, page, limit):
-        """Helper: Combine titles from both fragment nodes"""
-        offset = (page - 1) * limit
+    def _combine_fragment_titles(self, page, limit, after=None):
+        """
+        Helper: Combine titles from both fragment nodes.
         
-        all_titles = []
-        total_count = 0
+        Fragments are fetched as plain tuples and sorted by (start_year, tconst);
+        only the rows on the requested page are turned into dicts.
+        """
+        offset = (page - 1) * limit
         
-        node2_conn = self.get_connection('node2')
-        if node2_conn:
-            try:
-                cursor = node2_conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM titles ORDER BY start_year DESC")
-                all_titles.extend(cursor.fetchall())
-                cursor.execute("SELECT COUNT(*) as count FROM titles")
-                total_count += cursor.fetchone()['count']
-            except Error as e:
-                logger.warning(f"Error fetching from node2: {e}")
-            finally:
-                node2_conn.close()
+        rows = []
+        columns = None
         
-        node3_conn = self.get_connection('node3')
-        if node3_conn:
+        for node_name in ['node2', 'node3']:
+            conn = self.get_connection(node_name)
+            if not conn:
+                continue
             try:
-                cursor = node3_conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM titles ORDER BY start_year DESC")
-                all_titles.extend(cursor.fetchall())
-                cursor.execute("SELECT COUNT(*) as count FROM titles")
-                total_count += cursor.fetchone()['count']
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT {TITLE_COLUMNS} FROM titles")
+                rows.extend(cursor.fetchall())
+                columns = cursor.column_names
             except Error as e:
-                logger.warning(f"Error fetching from node3: {e}")
+                logger.warning(f"Error fetching from {node_name}: {e}")
             finally:
-                node3_conn.close()
+                conn.close()
         
-        if not all_titles:
+        if not rows:
             return {
                 'error': 'All nodes unavailable',
                 'data': [],
@@ -294,17 +547,38 @@ class DatabaseManager:
                 'limit': limit
             }
         
-        all_titles.sort(key=lambda x: x.get('start_year') or 0, reverse=True)
-        paginated_titles = all_titles[offset:offset + limit]
+        # Every fetched row counts, so the total needs no separate COUNT(*)
+        total_count = len(rows)
+        
+        year_index = columns.index('start_year')
+        tconst_index = columns.index('tconst')
+        rows.sort(key=lambda row: (row[year_index] or 0, row[tconst_index]), reverse=True)
+        
+        if after:
+            rows = [row for row in rows if self._is_after_cursor(row[year_index], row[tconst_index], after)]
+            offset = 0
+        
+        paginated_titles = [dict(zip(columns, row)) for row in rows[offset:offset + limit]]
         
         return {
             'data': paginated_titles,
             'total': total_count,
             'page': page,
             'limit': limit,
+            'next_cursor': self._next_cursor(paginated_titles, limit),
             'source': 'node2+node3 (combined)'
         }
     
+    def _is_after_cursor(self, year, tconst, after):
+        """Helper: True if (year, tconst) sorts after the (start_year, tconst) keyset cursor"""
+        after_year, after_tconst = after
+        
+        if after_year is None:
+            return year is None and tconst < after_tconst
+        if year is None:
+            return True
+        return (year, tconst) < (after_year, after_tconst)
+    
     def search_titles(self, search_term=None, year_from=None, year_to=None, 
                       title_type=None, genres=None, page=1, limit=20):
         """Search titles with filters"""
@@ -452,15 +726,37 @@ class DatabaseManager:
             'source': 'node2+node3 (combined)'
         }
     
-    def get_title_by_id(self, tconst):
-        """Get single title by ID with automatic fallback"""
+    def get_title_by_id(self, tconst, use_cache=True):
+        """
+        Get single title by ID with automatic fallback (cached).
+        
+        use_cache=False always reads from MySQL and leaves the cache alone
+        (the concurrency tests need real reads under the isolation level).
+        """
+        if not use_cache:
+            return self._fetch_title_by_id(tconst)
+        
+        with self._title_cache_lock:
+            title = self._title_cache.get(tconst)
+            generation = self._cache_generation
+        if title:
+            return dict(title)
+        
+        title = self._fetch_title_by_id(tconst)
+        
+        if 'error' not in title:
+            with self._title_cache_lock:
+                if generation == self._cache_generation:
+                    self._title_cache[tconst] = dict(title)
+        return title
+    
+    def _fetch_title_by_id(self, tconst):
+        """Helper: Read a title from node1, falling back to the fragments"""
         conn = self.get_connection('node1')
         
         if conn:
             try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM titles WHERE tconst = %s", (tconst,))
-                title = cursor.fetchone()
+                title = self._select_title(conn, tconst)
                 if title:
                     return title
             except Error as e:
@@ -475,9 +771,7 @@ class DatabaseManager:
             conn = self.get_connection(node_name)
             if conn:
                 try:
-                    cursor = conn.cursor(dictionary=True)
-                    cursor.execute("SELECT * FROM titles WHERE tconst = %s", (tconst,))
-                    title = cursor.fetchone()
+                    title = self._select_title(conn, tconst)
                     if title:
                         logger.info(f"Found {tconst} on {node_name} (fallback)")
                         return title
@@ -488,12 +782,71 @@ class DatabaseManager:
         
         return {'error': 'Title not found in any node'}
     
-    def execute_query(self, node_name, query, params=None, isolation_level='READ COMMITTED', autocommit=True):
+    def _select_title(self, conn, tconst):
+        """
+        Look up one title through a server-side prepared statement.
+        
+        The prepared cursor is kept on the underlying (pooled) connection, so
+        the statement is prepared once per session and later checkouts only
+        bind and execute. A reconnect starts a new session with a new
+        connection id, which triggers a fresh prepare.
+        """
+        cnx = getattr(conn, '_cnx', conn)
+        stmt = getattr(cnx, '_titles_by_id_stmt', None)
+        if stmt is None or stmt[0] != cnx.connection_id:
+            stmt = (cnx.connection_id, cnx.cursor(prepared=True))
+            cnx._titles_by_id_stmt = stmt
+        
+        cursor = stmt[1]
+        try:
+            cursor.execute(TITLE_BY_ID_QUERY, (tconst,))
+            rows = cursor.fetchall()
+        except Error:
+            # Statement may be gone server-side; prepare again next time
+            cnx._titles_by_id_stmt = None
+            raise
+        
+        return dict(zip(cursor.column_names, rows[0])) if rows else None
+    
+    def _prepared_cursor(self, conn, query):
+        """
+        Prepared cursor for query on this session, kept for reuse.
+        
+        Same scheme as _select_title, keyed by statement text: the first
+        execute prepares, later checkouts of the session only bind and
+        execute. Only pass statements from a fixed set of shapes.
+        """
+        cnx = getattr(conn, '_cnx', conn)
+        stmts = getattr(cnx, '_prepared_stmts', None)
+        if stmts is None or stmts[0] != cnx.connection_id:
+            stmts = (cnx.connection_id, {})
+            cnx._prepared_stmts = stmts
+        
+        cursors = stmts[1]
+        cursor = cursors.get(query)
+        if cursor is None:
+            if len(cursors) >= PREPARED_STMT_CACHE_SIZE:
+                cursors.pop(next(iter(cursors))).close()
+            cursor = cnx.cursor(prepared=True)
+            cursors[query] = cursor
+        return cursor
+    
+    def _drop_prepared(self, conn, query):
+        """Forget query's prepared cursor after an error (it's prepared again next time)"""
+        stmts = getattr(getattr(conn, '_cnx', conn), '_prepared_stmts', None)
+        if stmts:
+            stmts[1].pop(query, None)
+    
+    def execute_query(self, node_name, query, params=None, isolation_level=DEFAULT_ISOLATION_LEVEL,
+                      autocommit=True, prepared=False):
         """
         Execute a write query (INSERT/UPDATE/DELETE).
         
+        prepared=True runs it through a per-session prepared statement
+        (see _prepared_cursor).
+        
         Returns:
-            dict with 'success', 'rows_affected', 'error' (if failed)
+            dict with 'success', 'rows_affected', 'error' and 'errno' (if failed)
         """
         conn = self.get_connection(node_name, isolation_level)
         
@@ -504,31 +857,95 @@ class DatabaseManager:
             if not autocommit:
                 conn.start_transaction()
             
-            cursor = conn.cursor()
+            cursor = self._prepared_cursor(conn, query) if prepared else conn.cursor()
             cursor.execute(query, params or ())
             
             if autocommit:
                 conn.commit()
             
+            if TITLES_WRITE_PATTERN.match(query):
+                self.invalidate_caches()
+            
             return {
                 'success': True, 
                 'rows_affected': cursor.rowcount, 
                 'connection': conn if not autocommit else None
             }
         except Error as e:
+            if prepared:
+                self._drop_prepared(conn, query)
             if autocommit:
                 conn.rollback()
             logger.error(f"Error executing query on {node_name}: {e}")
             return {
                 'success': False, 
                 'error': str(e), 
+                'errno': e.errno,
                 'connection': conn if not autocommit else None
             }
         finally:
             if autocommit:
                 conn.close()
 
-    def execute_select(self, node_name, query, params=None, isolation_level='READ COMMITTED'):
+    def execute_query_returning(self, node_name, query, params, fetch_query, fetch_params,
+                                isolation_level=DEFAULT_ISOLATION_LEVEL, prepared=False):
+        """
+        Execute a write and read back from the same node in one transaction.
+        
+        Used to pick up server-generated values (e.g. last_updated) from the
+        row just written, without a second connection or a read that could
+        land on another node. prepared=True runs both statements through
+        per-session prepared statements.
+        
+        Returns:
+            dict with 'success', 'rows_affected', 'row' (dict or None), 'error' and 'errno' (if failed)
+        """
+        conn = self.get_connection(node_name, isolation_level)
+        
+        if not conn:
+            return {'success': False, 'error': f'{node_name} unavailable'}
+        
+        try:
+            conn.start_transaction()
+            if prepared:
+                cursor = self._prepared_cursor(conn, query)
+                cursor.execute(query, params or ())
+                rows_affected = cursor.rowcount
+                cursor = self._prepared_cursor(conn, fetch_query)
+                cursor.execute(fetch_query, fetch_params or ())
+                rows = cursor.fetchall()
+                row = dict(zip(cursor.column_names, rows[0])) if rows else None
+            else:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(query, params or ())
+                rows_affected = cursor.rowcount
+                cursor.execute(fetch_query, fetch_params or ())
+                row = cursor.fetchone()
+            conn.commit()
+            
+            if TITLES_WRITE_PATTERN.match(query):
+                self.invalidate_caches()
+            
+            return {
+                'success': True,
+                'rows_affected': rows_affected,
+                'row': row
+            }
+        except Error as e:
+            if prepared:
+                self._drop_prepared(conn, query)
+                self._drop_prepared(conn, fetch_query)
+            conn.rollback()
+            logger.error(f"Error executing query on {node_name}: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'errno': e.errno
+            }
+        finally:
+            conn.close()
+
+    def execute_select(self, node_name, query, params=None, isolation_level=DEFAULT_ISOLATION_LEVEL):
         """
         Execute a SELECT query and return results.
         
@@ -560,7 +977,7 @@ class DatabaseManager:
         finally:
             conn.close()
 
-    def execute_select_one(self, node_name, query, params=None, isolation_level='READ COMMITTED'):
+    def execute_select_one(self, node_name, query, params=None, isolation_level=DEFAULT_ISOLATION_LEVEL):
         """
         Execute a SELECT query and return first result.
         
@@ -1,150 +1,315 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from db_manager import DatabaseManager
+from mysql.connector import Error, errorcode
 import os
+import tempfile
 
 logger = logging.getLogger(__name__)
 
-def initialize_fragments_from_central(db_manager):
+# Secondary indexes on titles (init-scripts/create_schema.sql), name -> column.
+# Dropped around bulk loads so InnoDB builds them by sort instead of row by row.
+TITLES_SECONDARY_INDEXES = {
+    'idx_title_type': 'title_type',
+    'idx_year': 'start_year',
+    'idx_runtime': 'runtime_minutes'
+}
+
+# Rows per executemany() call; keeps each multi-row INSERT under max_allowed_packet
+INSERT_BATCH_SIZE = 5000
+
+# Server refusals of LOAD DATA LOCAL that mean "use batched INSERTs instead"
+LOCAL_INFILE_DISABLED_ERRNOS = (errorcode.ER_CLIENT_LOCAL_FILES_DISABLED, errorcode.ER_NOT_ALLOWED_COMMAND)
+
+@contextmanager
+def _node_connection(conns, node_name, connect):
     """
-    Copy data from central node to fragments, preserving timestamps.
-    Run this ONCE on startup after central is populated.
+    Yield the connection to use for node_name (None if unavailable).
+    
+    With conns (the reset pipeline's shared connections) the shared one is
+    lent out and left open; otherwise one is opened with connect and closed.
     """
-    logger.info("Starting fragment initialization from central node...")
+    if conns is not None:
+        yield conns.get(node_name)
+        return
     
-    central_node = 'node1'
+    conn = connect(node_name)
+    try:
+        yield conn
+    finally:
+        if conn:
+            conn.close()
+
+def _row_to_tuple(row):
+    """Convert a titles row dict into the INSERT parameter order"""
+    return (
+        row['tconst'],
+        row['title_type'],
+        row['primary_title'],
+        row['start_year'],
+        row['runtime_minutes'],
+        row['genres'],
+        row['last_updated']
+    )
+
+def _insert_in_batches(cursor, insert_query, rows):
+    """
+    Insert rows with executemany() so the driver sends multi-row INSERTs.
     
-    # Get all movies from central
-    conn = db_manager.get_connection(central_node)
-    if not conn:
-        logger.error("Cannot connect to central node for initialization")
-        return False
+    rows can be any iterable (e.g. an unbuffered cursor), only one batch
+    is held in memory at a time. Returns the number of rows inserted.
+    
+    Use a plain cursor, not cursor(prepared=True): the prepared cursor
+    executes the statement once per row, which loses the multi-row rewrite.
+    """
+    batch = []
+    copied = 0
     
+    for row in rows:
+        batch.append(_row_to_tuple(row))
+        if len(batch) >= INSERT_BATCH_SIZE:
+            cursor.executemany(insert_query, batch)
+            copied += len(batch)
+            batch = []
+    
+    if batch:
+        cursor.executemany(insert_query, batch)
+        copied += len(batch)
+    
+    return copied
+
+# LOAD DATA's default field format: tab-separated, backslash-escaped, \N for NULL
+_LOAD_ESCAPES = str.maketrans({'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r', '\0': '\\0'})
+
+def _load_field(value):
+    """Encode one value for LOAD DATA's default (tab-separated) format"""
+    if value is None:
+        return '\\N'
+    return str(value).translate(_LOAD_ESCAPES)
+
+def _load_via_local_infile(cursor, rows):
+    """
+    Write rows to a temp file and LOAD DATA LOCAL INFILE it through cursor.
+    
+    The server takes its bulk-load path instead of parsing INSERT
+    statements. Requires a connection opened with allow_local_infile
+    (DatabaseManager.get_bulk_connection) and local_infile=ON on the server.
+    Returns the number of rows loaded.
+    """
+    tmp = tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', newline='', suffix='.tsv', delete=False)
     try:
-        cursor = conn.cursor(dictionary=True)
+        with tmp:
+            for row in rows:
+                tmp.write('\t'.join(_load_field(value) for value in _row_to_tuple(row)))
+                tmp.write('\n')
         
-        # === MOVIES to node2 ===
         cursor.execute("""
-            SELECT tconst, title_type, primary_title, start_year, 
-                   runtime_minutes, genres, last_updated
-            FROM titles 
-            WHERE title_type = 'movie'
-        """)
-        movies = cursor.fetchall()
+            LOAD DATA LOCAL INFILE %s
+            INTO TABLE titles
+            CHARACTER SET utf8mb4
+            (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
+        """, (tmp.name,))
+        return cursor.rowcount
+    finally:
+        os.unlink(tmp.name)
+
+def _copy_partition(db_manager, target_node, label, where_clause, conns=None):
+    """
+    Copy one horizontal fragment from central to target_node.
+    
+    Opens its own central connection so partitions can be copied in
+    parallel without sharing a cursor. Returns False on error.
+    
+    Rows pass through the backend on purpose: each node is a separate
+    MySQL server, so SELECT ... INTO OUTFILE lands on node1's disk where
+    node2/node3 cannot LOAD it, and FEDERATED is disabled by default.
+    """
+    central_node = 'node1'
+    
+    # Insert with preserved timestamps
+    insert_query = """
+        INSERT INTO titles 
+        (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """
+    
+    with _node_connection(conns, target_node, db_manager.get_bulk_connection) as target_conn:
+        if not target_conn:
+            logger.warning(f"{target_node} unavailable, skipping {label}")
+            return True
         
-        logger.info(f"Copying {len(movies)} movies to node2...")
+        # Always a separate central connection: both partitions read node1 at once
+        conn = db_manager.get_connection(central_node)
+        if not conn:
+            logger.error(f"Cannot connect to central node to copy {label}")
+            return False
         
-        node2_conn = db_manager.get_connection('node2')
-        if node2_conn:
-            node2_cursor = node2_conn.cursor()
-            
-            # Clear existing data first
-            node2_cursor.execute("DELETE FROM titles")
-            
-            # Insert with preserved timestamps
-            insert_query = """
-                INSERT INTO titles 
-                (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            
-            for movie in movies:
-                node2_cursor.execute(insert_query, (
-                    movie['tconst'],
-                    movie['title_type'],
-                    movie['primary_title'],
-                    movie['start_year'],
-                    movie['runtime_minutes'],
-                    movie['genres'],
-                    movie['last_updated'] 
-                ))
-            
-            node2_conn.commit()
-            node2_conn.close()
-            logger.info(f"✓ Successfully copied {len(movies)} movies to node2")
+        try:
+            return _copy_titles(conn, target_conn, target_node, label, where_clause, insert_query)
+        finally:
+            conn.close()
+
+def _copy_titles(conn, target_conn, target_node, label, where_clause, insert_query):
+    """Helper: Replace target_conn's titles with central rows matching where_clause"""
+    target_cursor = target_conn.cursor()
+    
+    try:
+        # One transaction for the whole partition: a single redo-log flush at
+        # commit, and no per-row unique/FK checks while loading
+        target_conn.autocommit = False
+        target_cursor.execute("SET SESSION unique_checks = 0, SESSION foreign_key_checks = 0")
         
-        # === NON-MOVIES to node3 ===
-        cursor.execute("""
+        # Clear existing data first
+        target_cursor.execute("DELETE FROM titles")
+        
+        logger.info(f"Copying {label} to {target_node}...")
+        
+        select_query = f"""
             SELECT tconst, title_type, primary_title, start_year, 
                    runtime_minutes, genres, last_updated
             FROM titles 
-            WHERE title_type != 'movie'
-        """)
-        non_movies = cursor.fetchall()
-        
-        logger.info(f"Copying {len(non_movies)} non-movies to node3...")
+            WHERE {where_clause}
+        """
         
-        node3_conn = db_manager.get_connection('node3')
-        if node3_conn:
-            node3_cursor = node3_conn.cursor()
-            node3_cursor.execute("DELETE FROM titles")
-            
-            for title in non_movies:
-                node3_cursor.execute(insert_query, (
-                    title['tconst'],
-                    title['title_type'],
-                    title['primary_title'],
-                    title['start_year'],
-                    title['runtime_minutes'],
-                    title['genres'],
-                    title['last_updated']
-                ))
-            
-            node3_conn.commit()
-            node3_conn.close()
-            logger.info(f"✓ Successfully copied {len(non_movies)} non-movies to node3")
+        # Unbuffered: rows are read from the socket as we iterate
+        cursor = conn.cursor(dictionary=True, buffered=False)
+        cursor.execute(select_query)
+        try:
+            copied = _load_via_local_infile(target_cursor, cursor)
+        except Error as e:
+            # Only local_infile being disabled falls back; other failures
+            # (lost source, bad rows) go to the outer handler
+            if e.errno not in LOCAL_INFILE_DISABLED_ERRNOS:
+                raise
+            # local_infile disabled: re-read and use batched INSERTs
+            logger.warning(f"LOAD DATA LOCAL unavailable on {target_node} ({e}), falling back to INSERT batches")
+            cursor.close()
+            cursor = conn.cursor(dictionary=True, buffered=False)
+            cursor.execute(select_query)
+            copied = _insert_in_batches(target_cursor, insert_query, cursor)
         
-        logger.info("✓ Fragment initialization complete!")
+        target_conn.commit()
+        logger.info(f"✓ Successfully copied {copied} {label} to {target_node}")
         return True
         
     except Exception as e:
-        logger.error(f"Error during fragment initialization: {e}")
+        logger.error(f"Error copying {label} to {target_node}: {e}")
+        target_conn.rollback()
         return False
     finally:
-        conn.close()
+        # The session may be reused (pool or reset pipeline), so restore the checks
+        try:
+            target_cursor.execute("SET SESSION unique_checks = 1, SESSION foreign_key_checks = 1")
+        except Exception as e:
+            logger.warning(f"Could not restore session checks on {target_node}: {e}")
+
+def initialize_fragments_from_central(db_manager, conns=None):
+    """
+    Copy data from central node to fragments, preserving timestamps.
+    Run this ONCE on startup after central is populated.
+    
+    Rows are streamed from central with an unbuffered cursor into a temp
+    file and bulk-loaded with LOAD DATA LOCAL INFILE (batched INSERTs if
+    the server refuses local infile), so memory stays bounded.
+    node2 and node3 are independent servers, so both copies run in parallel.
+    conns optionally supplies already-open node2/node3 connections.
+    """
+    logger.info("Starting fragment initialization from central node...")
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        movies = executor.submit(
+            _copy_partition, db_manager, 'node2', 'movies', "title_type = 'movie'", conns
+        )
+        non_movies = executor.submit(
+            _copy_partition, db_manager, 'node3', 'non-movies', "title_type != 'movie'", conns
+        )
+        results = [movies.result(), non_movies.result()]
+    
+    # Rows were written outside execute_query, so cached counts are stale
+    db_manager.invalidate_caches()
+    
+    if not all(results):
+        logger.error("Fragment initialization failed")
+        return False
+    
+    logger.info("✓ Fragment initialization complete!")
+    return True
 
 
-def clear_all_nodes(db_manager):
+def _existing_secondary_indexes(cursor):
+    """Names of the titles secondary indexes currently present"""
+    cursor.execute("""
+        SELECT DISTINCT index_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'titles'
+    """)
+    return {row[0] for row in cursor.fetchall()} & set(TITLES_SECONDARY_INDEXES)
+
+def _drop_secondary_indexes(cursor):
+    """Drop the titles secondary indexes in a single ALTER"""
+    existing = _existing_secondary_indexes(cursor)
+    if existing:
+        cursor.execute("ALTER TABLE titles " + ", ".join(
+            f"DROP INDEX {name}" for name in TITLES_SECONDARY_INDEXES if name in existing
+        ))
+
+def _add_secondary_indexes(cursor):
+    """Recreate missing titles secondary indexes in a single ALTER (one sort-based build)"""
+    existing = _existing_secondary_indexes(cursor)
+    missing = [name for name in TITLES_SECONDARY_INDEXES if name not in existing]
+    if missing:
+        cursor.execute("ALTER TABLE titles " + ", ".join(
+            f"ADD INDEX {name} ({TITLES_SECONDARY_INDEXES[name]})" for name in missing
+        ))
+
+
+def clear_all_nodes(db_manager, conns=None):
     """
-    Delete all data from all nodes.
+    Delete all data from all nodes (in parallel).
     Returns dict with results per node.
     """
     logger.info("Clearing all tables...")
-    results = []
+    nodes = ['node1', 'node2', 'node3']
     
-    for node_name in ['node1', 'node2', 'node3']:
-        conn = db_manager.get_connection(node_name)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("DELETE FROM titles")
-                rows_deleted = cursor.rowcount
-                conn.commit()
-                results.append({
-                    'node': node_name,
-                    'success': True,
-                    'rows_deleted': rows_deleted
-                })
-                logger.info(f"  ✓ {node_name}: Deleted {rows_deleted} rows")
-            except Exception as e:
-                logger.error(f"  ✗ {node_name}: Error - {e}")
-                results.append({
-                    'node': node_name,
-                    'success': False,
-                    'error': str(e)
-                })
-            finally:
-                conn.close()
-        else:
-            results.append({
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        return list(executor.map(lambda node_name: _clear_node(db_manager, node_name, conns), nodes))
+
+
+def _clear_node(db_manager, node_name, conns=None):
+    """Delete all rows from a single node, returns its result dict"""
+    with _node_connection(conns, node_name, db_manager.get_connection) as conn:
+        if not conn:
+            return {
                 'node': node_name,
                 'success': False,
                 'error': 'Cannot connect to node'
-            })
-    
-    return results
+            }
+        return _clear_titles(conn, node_name)
+
+
+def _clear_titles(conn, node_name):
+    """Helper: DELETE every title on conn"""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM titles")
+        rows_deleted = cursor.rowcount
+        conn.commit()
+        logger.info(f"  ✓ {node_name}: Deleted {rows_deleted} rows")
+        return {
+            'node': node_name,
+            'success': True,
+            'rows_deleted': rows_deleted
+        }
+    except Exception as e:
+        logger.error(f"  ✗ {node_name}: Error - {e}")
+        return {
+            'node': node_name,
+            'success': False,
+            'error': str(e)
+        }
 
 
-def import_csv_to_node1(db_manager):
+def import_csv_to_node1(db_manager, conns=None):
     """
     Import CSV file into node1 using LOAD DATA INFILE.
     
@@ -158,17 +323,27 @@ def import_csv_to_node1(db_manager):
     
     logger.info(f"Importing CSV into node1 from: {csv_path}")
     
-    conn = db_manager.get_connection('node1')
-    if not conn:
-        error_msg = "Cannot connect to node1"
-        logger.error(f"  ✗ {error_msg}")
-        return {
-            'success': False,
-            'error': error_msg
-        }
+    with _node_connection(conns, 'node1', db_manager.get_connection) as conn:
+        if not conn:
+            error_msg = "Cannot connect to node1"
+            logger.error(f"  ✗ {error_msg}")
+            return {
+                'success': False,
+                'error': error_msg
+            }
+        return _load_csv(conn, csv_path)
+
+
+def _load_csv(conn, csv_path):
+    """Helper: LOAD DATA INFILE csv_path into node1's titles over conn"""
+    cursor = conn.cursor()
+    indexes_dropped = False
     
     try:
-        cursor = conn.cursor()
+        # Defer secondary-index maintenance and per-row checks until after the load
+        cursor.execute("SET SESSION unique_checks = 0, SESSION foreign_key_checks = 0")
+        _drop_secondary_indexes(cursor)
+        indexes_dropped = True
         
         # LOAD DATA INFILE
         load_query = """
@@ -183,6 +358,9 @@ def import_csv_to_node1(db_manager):
         cursor.execute(load_query, (csv_path,))
         conn.commit()
         
+        _add_secondary_indexes(cursor)
+        indexes_dropped = False
+        
         # Verify import
         cursor.execute("SELECT COUNT(*) as count FROM titles")
         import_count = cursor.fetchone()[0]
@@ -208,31 +386,39 @@ def import_csv_to_node1(db_manager):
             'error': error_msg
         }
     finally:
-        conn.close()
+        # Leave the table and the pooled session as we found them, even on error
+        try:
+            if indexes_dropped:
+                _add_secondary_indexes(cursor)
+            cursor.execute("SET SESSION unique_checks = 1, SESSION foreign_key_checks = 1")
+        except Exception as e:
+            logger.error(f"  ✗ Could not restore indexes/session checks on node1: {e}")
 
 
-def get_node_counts(db_manager):
+def get_node_counts(db_manager, conns=None):
     """
-    Get row counts from all nodes.
+    Get row counts from all nodes (queried in parallel).
     Returns dict with counts per node.
     """
-    counts = {}
-    
-    for node_name in ['node1', 'node2', 'node3']:
-        conn = db_manager.get_connection(node_name)
-        if conn:
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT COUNT(*) as count FROM titles")
-                counts[node_name] = cursor.fetchone()[0]
-            except Exception as e:
-                counts[node_name] = f"Error: {e}"
-            finally:
-                conn.close()
-        else:
-            counts[node_name] = "Offline"
+    nodes = ['node1', 'node2', 'node3']
     
-    return counts
+    with ThreadPoolExecutor(max_workers=len(nodes)) as executor:
+        counts = executor.map(lambda node_name: _count_node(db_manager, node_name, conns), nodes)
+        return dict(zip(nodes, counts))
+
+
+def _count_node(db_manager, node_name, conns=None):
+    """Row count of a single node, or an error/offline string"""
+    with _node_connection(conns, node_name, db_manager.get_connection) as conn:
+        if not conn:
+            return "Offline"
+        
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) as count FROM titles")
+            return cursor.fetchone()[0]
+        except Exception as e:
+            return f"Error: {e}"
 
 
 def reset_and_reinitialize_database(db_manager):
@@ -243,18 +429,38 @@ def reset_and_reinitialize_database(db_manager):
     3. Initialize fragments
     
     Returns detailed results dict.
+    
+    One connection per node is opened up front and shared by every step
+    (node2/node3 get bulk connections so the fragment load can use them).
     """
     logger.info("=" * 60)
     logger.info("STARTING DATABASE RESET PIPELINE")
     logger.info("=" * 60)
     
+    conns = {
+        'node1': db_manager.get_connection('node1'),
+        'node2': db_manager.get_bulk_connection('node2'),
+        'node3': db_manager.get_bulk_connection('node3')
+    }
+    
+    try:
+        return _run_reset_pipeline(db_manager, conns)
+    finally:
+        for conn in conns.values():
+            if conn:
+                conn.close()
+
+
+def _run_reset_pipeline(db_manager, conns):
+    """Helper: Steps of reset_and_reinitialize_database over shared connections"""
     results = {
         'steps': [],
         'success': False
     }
     
     logger.info("Step 1: Clearing all tables...")
-    clear_results = clear_all_nodes(db_manager)
+    clear_results = clear_all_nodes(db_manager, conns)
+    db_manager.invalidate_caches()
     
     if not all(r['success'] for r in clear_results):
         results['steps'].append({
@@ -273,7 +479,7 @@ def reset_and_reinitialize_database(db_manager):
     })
     
     logger.info("Step 2: Re-importing CSV into node1...")
-    import_result = import_csv_to_node1(db_manager)
+    import_result = import_csv_to_node1(db_manager, conns)
     
     if not import_result['success']:
         results['steps'].append({
@@ -291,8 +497,10 @@ def reset_and_reinitialize_database(db_manager):
         'rows_imported': import_result['rows_imported']
     })
     
+    db_manager.invalidate_caches()
+    
     logger.info("Step 3: Initializing fragments from central...")
-    fragment_success = initialize_fragments_from_central(db_manager)
+    fragment_success = initialize_fragments_from_central(db_manager, conns)
     
     if not fragment_success:
         results['steps'].append({
@@ -304,7 +512,7 @@ def reset_and_reinitialize_database(db_manager):
         return results
     
     # Get final counts
-    final_counts = get_node_counts(db_manager)
+    final_counts = get_node_counts(db_manager, conns)
     
     results['steps'].append({
         'step': 3,
@@ -2,109 +2,244 @@ import logging
 import threading
 import time
 import random
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
+from mysql.connector import errorcode
+from db_manager import TITLE_COLUMNS, POOL_SIZE
 
 logger = logging.getLogger(__name__)
 
+# Worker threads shared by every test run (tests may run concurrently from the API)
+TEST_POOL_SIZE = 32
+
+# Case #3 writers all hit the same fragment at once; one per pooled connection
+# keeps them from spilling into dedicated connections and thrashing the node
+MAX_CONCURRENT_WRITERS = min(POOL_SIZE, TEST_POOL_SIZE)
+
+# Seconds a test worker waits at its start barrier; if the shared pool is saturated
+# and not every party gets a thread, the test fails instead of hanging
+BARRIER_TIMEOUT = 10
+
+# Seconds the auto-selected test record is reused before it is looked up again
+TEST_RECORD_TTL = 30
+
+# Busy polls a SpinBarrier waiter makes before each sleep(0) that yields the GIL
+SPIN_ITERATIONS = 100
+
+# How test readers read: get_title_by_id(use_cache=False) skips the title cache
+# and issues a plain autocommit SELECT (never FOR SHARE / FOR UPDATE), which
+# InnoDB serves from an MVCC snapshot at any isolation level, so readers never
+# take row locks or wait on writers
+READ_MODE = 'Non-locking consistent read (uncached autocommit SELECT through get_title_by_id)'
+
+def _format_timestamps(worker_results):
+    """Turn the workers' raw time_ns() stamps into the ISO strings the frontend shows"""
+    for result in worker_results.values():
+        stamp = result.pop('timestamp_ns', None)
+        if stamp is not None:
+            result['timestamp'] = datetime.fromtimestamp(stamp / 1e9).isoformat()
+    return worker_results
+
+class SpinBarrier:
+    """
+    Start barrier whose waiters spin on a generation counter instead of
+    sleeping on a Condition.
+    
+    Waiters notice the last arrival on their next poll rather than after a
+    notify and wakeup, so the parties' start times line up more tightly.
+    Mirrors threading.Barrier: wait() raises threading.BrokenBarrierError
+    for every party once one of them times out.
+    """
+    
+    def __init__(self, parties, timeout=None):
+        self.parties = parties
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._remaining = parties
+        self._generation = 0
+        self._broken = False
+    
+    def wait(self):
+        with self._lock:
+            if self._broken:
+                raise threading.BrokenBarrierError
+            generation = self._generation
+            self._remaining -= 1
+            if self._remaining == 0:
+                self._remaining = self.parties
+                self._generation += 1
+                return
+        
+        deadline = None if self.timeout is None else time.perf_counter() + self.timeout
+        spins = 0
+        while self._generation == generation:
+            if self._broken:
+                raise threading.BrokenBarrierError
+            spins += 1
+            if spins % SPIN_ITERATIONS == 0:
+                if deadline is not None and time.perf_counter() > deadline:
+                    with self._lock:
+                        # The last party may have arrived while we checked the clock
+                        if self._generation != generation:
+                            return
+                        self._broken = True
+                    raise threading.BrokenBarrierError
+                time.sleep(0)
+
 class ConcurrencyTester:
     def __init__(self, db_manager, replication_manager):
         self.db = db_manager
         self.replication_manager = replication_manager
+        self._pool = ThreadPoolExecutor(max_workers=TEST_POOL_SIZE, thread_name_prefix='conc-test')
+        # (tconst, looked_up_at) for _get_test_record
+        self._test_record = None
+    
+    def _run_concurrently(self, calls):
+        """
+        Submit (fn, *args) tuples to the shared pool and wait for all of them.
+        
+        Returns the workers' return values in call order (None for a worker
+        that raised), so results are merged on the calling thread without locks.
+        """
+        futures = [self._pool.submit(*call) for call in calls]
+        wait(futures)
+        
+        values = []
+        for future in futures:
+            if future.exception():
+                logger.error(f"Concurrency test worker failed: {future.exception()}")
+                values.append(None)
+            else:
+                values.append(future.result())
+        return values
+    
+    def _simulated_delay(self, enabled, seconds=0.1):
+        """Optional pause between a reader's two reads; returns the time spent so it can be left out of durations"""
+        if not enabled:
+            return 0.0
+        paused_at = time.perf_counter()
+        time.sleep(seconds)
+        return time.perf_counter() - paused_at
     
     def _get_test_record(self):
-        """Get a record suitable for testing."""
-        conn = self.db.get_connection('node1')
-        if conn:
-            try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("""
-                    SELECT tconst, title_type, runtime_minutes 
-                    FROM titles 
-                    WHERE title_type = 'movie' 
-                    AND runtime_minutes IS NOT NULL
-                    LIMIT 1
-                """)
-                record = cursor.fetchone()
-                if record:
-                    return record['tconst']
-            except Exception as e:
-                logger.warning(f"Error getting test record: {e}")
-            finally:
-                conn.close()
+        """Get a record suitable for testing (reused for TEST_RECORD_TTL seconds)."""
+        cached = self._test_record
+        if cached and time.monotonic() - cached[1] < TEST_RECORD_TTL:
+            return cached[0]
+        
+        result = self.db.execute_select_one('node1', """
+            SELECT tconst, title_type, runtime_minutes 
+            FROM titles 
+            WHERE title_type = 'movie' 
+            AND runtime_minutes IS NOT NULL
+            LIMIT 1
+        """)
+        if result['success'] and result['data']:
+            tconst = result['data']['tconst']
+            self._test_record = (tconst, time.monotonic())
+            return tconst
+        if not result['success']:
+            logger.warning(f"Error getting test record: {result['error']}")
         return 'tt0035423'
     
-    def test_concurrent_reads(self, tconst=None, isolation_level='READ COMMITTED'):
+    def _read_title_from_node(self, node_name, tconst):
+        """
+        Read a title straight from one node (pooled connection via DatabaseManager).
+        
+        Returns the row, {'error': ...} on a query error, or None if the node is offline.
+        """
+        result = self.db.execute_select_one(
+            node_name, f"SELECT {TITLE_COLUMNS} FROM titles WHERE tconst = %s", (tconst,)
+        )
+        if result['success']:
+            return result['data']
+        if result['error'] == f'{node_name} unavailable':
+            return None
+        return {'error': result['error']}
+    
+    def _read_final_values(self, tconst, fragment_node):
+        """
+        Post-test verification: read tconst from node1 and its fragment in parallel.
+        
+        Returns {node: row}; an offline fragment is left out.
+        """
+        central, fragment = self._run_concurrently([
+            (self.db.get_title_by_id, tconst, False),
+            (self._read_title_from_node, fragment_node, tconst)
+        ])
+        
+        final_values = {'node1': central}
+        if fragment is not None:
+            final_values[fragment_node] = fragment
+        return final_values
+    
+    def test_concurrent_reads(self, tconst=None, isolation_level='READ COMMITTED', simulate_delay=False):
         """
         Case #1: Concurrent reads through application API
         
         Tests how the application handles concurrent read requests with automatic
-        node fallback and location transparency.
+        node fallback and location transparency. simulate_delay adds a 0.1s
+        pause between each reader's two reads to widen the test window.
         """
         if not tconst:
             tconst = self._get_test_record()
             logger.info(f"[Case #1] Auto-selected test record: {tconst}")
         
-        results = {}
-        threads = []
-        lock = threading.Lock()
-        start_barrier = threading.Barrier(3)
+        start_barrier = SpinBarrier(3, timeout=BARRIER_TIMEOUT)
         
-        title = self.db.get_title_by_id(tconst)
+        title = self.db.get_title_by_id(tconst, use_cache=False)
         if 'error' in title:
             return {'error': f'Title {tconst} not found'}
         
         title_type = title.get('title_type')
-        test_nodes = ['node1', 'node2', 'node2'] if title_type == 'movie' else ['node1', 'node3', 'node3']
+        fragment_node = self.replication_manager._get_primary_node(title_type)
+        test_nodes = ['node1', fragment_node, fragment_node]
         
         def concurrent_read(node_name, reader_id):
-            """Reader using application API (get_title_by_id)"""
+            """Reader using application API (get_title_by_id, uncached)"""
             try:
                 start_barrier.wait()
-                start_time = time.time()
+                start_time = time.perf_counter()
                 
                 # First read through application API
-                data1 = self.db.get_title_by_id(tconst)
-                read1_time = time.time()
+                data1 = self.db.get_title_by_id(tconst, use_cache=False)
+                read1_time = time.perf_counter()
                 
-                time.sleep(0.1)
+                delay = self._simulated_delay(simulate_delay)
                 
                 # Second read through application API
-                data2 = self.db.get_title_by_id(tconst)
-                read2_time = time.time()
-                end_time = time.time()
+                data2 = self.db.get_title_by_id(tconst, use_cache=False)
+                read2_time = time.perf_counter()
+                end_time = time.perf_counter()
                 
-                with lock:
-                    results[f'{node_name}_{reader_id}'] = {
-                        'success': 'error' not in data1,
-                        'node': node_name,
-                        'reader_id': reader_id,
-                        'data': data1 if 'error' not in data1 else None,
-                        'repeatable': data1 == data2,
-                        'duration': round(end_time - start_time, 4),
-                        'read1_time': round(read1_time - start_time, 4),
-                        'read2_time': round(read2_time - start_time, 4),
-                        'isolation_level': isolation_level,
-                        'timestamp': datetime.now().isoformat()
-                    }
+                return f'{node_name}_{reader_id}', {
+                    'success': 'error' not in data1,
+                    'node': node_name,
+                    'reader_id': reader_id,
+                    'data': data1 if 'error' not in data1 else None,
+                    'repeatable': data1 == data2,
+                    'duration': round(end_time - start_time - delay, 4),
+                    'read1_time': round(read1_time - start_time, 4),
+                    'read2_time': round(read2_time - start_time, 4),
+                    'isolation_level': isolation_level,
+                    'timestamp_ns': time.time_ns()
+                }
             except Exception as e:
-                with lock:
-                    results[f'{node_name}_{reader_id}'] = {
-                        'success': False,
-                        'error': str(e),
-                        'node': node_name
-                    }
+                return f'{node_name}_{reader_id}', {
+                    'success': False,
+                    'error': str(e),
+                    'node': node_name
+                }
         
-        for i, node in enumerate(test_nodes):
-            t = threading.Thread(target=concurrent_read, args=(node, i))
-            threads.append(t)
-            t.start()
-        
-        for t in threads:
-            t.join()
+        results = _format_timestamps(dict(filter(None, self._run_concurrently(
+            [(concurrent_read, node, i) for i, node in enumerate(test_nodes)]
+        ))))
         
         successful_reads = [r for r in results.values() if r.get('success')]
-        data_values = [str(r['data']) for r in successful_reads if r.get('data')]
-        consistent = len(set(data_values)) <= 1
+        # Rows hold only hashable column values; compare them order-independently
+        data_values = {frozenset(r['data'].items()) for r in successful_reads if r.get('data')}
+        consistent = len(data_values) <= 1
+        repeatable = all(r.get('repeatable', False) for r in successful_reads)
         
         return {
             'test': 'concurrent_reads',
@@ -118,20 +253,22 @@ class ConcurrencyTester:
             'consistent': consistent,
             'all_reads_succeeded': len(successful_reads) == len(test_nodes),
             'analysis': {
+                'read_mode': READ_MODE,
                 'blocking_observed': any(r.get('duration', 0) > 1 for r in successful_reads),
                 'data_consistent_across_nodes': consistent,
-                'repeatable_reads_within_application': all(r.get('repeatable', False) for r in successful_reads),
+                'repeatable_reads_within_application': repeatable,
                 'average_duration': round(sum(r.get('duration', 0) for r in successful_reads) / len(successful_reads), 4) if successful_reads else 0,
-                'explanation': self._explain_read_behavior(isolation_level, consistent, all(r.get('repeatable', False) for r in successful_reads))
+                'explanation': self._explain_read_behavior(isolation_level, consistent, repeatable)
             }
         }
     
-    def test_read_write_conflict(self, tconst=None, new_data=None, isolation_level='READ COMMITTED'):
+    def test_read_write_conflict(self, tconst=None, new_data=None, isolation_level='READ COMMITTED', simulate_delay=False):
         """
         Case #2: Concurrent writes (with replication) and reads through application API
         
         Writers use replication_manager.update_title() which handles distributed updates.
-        Readers use get_title_by_id() which may see updates as they commit.
+        Readers use uncached get_title_by_id() which may see updates as they commit.
+        simulate_delay staggers the readers and pauses 0.1s between their reads.
         """
         if not tconst:
             tconst = self._get_test_record()
@@ -149,9 +286,8 @@ class ConcurrencyTester:
             'readers': {},
             'final_values': {}
         }
-        lock = threading.Lock()
         
-        original = self.db.get_title_by_id(tconst)
+        original = self.db.get_title_by_id(tconst, use_cache=False)
         if 'error' in original:
             return {'error': f'Title {tconst} not found'}
         
@@ -159,125 +295,111 @@ class ConcurrencyTester:
         original_runtime = original.get('runtime_minutes')
         title_type = original.get('title_type')
         
-        start_barrier = threading.Barrier(4)  # 2 writers + 2 readers
+        # Written columns whose new value differs from the original; a reader that
+        # reads any of these back has seen a write
+        changed_items = tuple(
+            (column, value) for column, value in new_data.items() if original.get(column) != value
+        )
+        
+        start_barrier = SpinBarrier(4, timeout=BARRIER_TIMEOUT)  # 2 writers + 2 readers
+        reader_started = threading.Event()
         
         def writer_transaction(writer_id):
             """Writer using replication_manager (production code path)"""
             try:
                 start_barrier.wait()
-                start_time = time.time()
+                start_time = time.perf_counter()
                 
                 logger.info(f"[Case #2] Writer {writer_id} calling replication_manager.update_title()")
                 
                 result = self.replication_manager.update_title(tconst, new_data, isolation_level)
+                end_time = time.perf_counter()
                 
-                time.sleep(0.3)  # Hold to allow reader overlap
-                end_time = time.time()
+                # Stay alive until a reader has issued its first read, instead of a fixed hold
+                reader_started.wait(timeout=1.0)
                 
                 logger.info(f"[Case #2] Writer {writer_id} completed: {result.get('success')}")
                 
-                with lock:
-                    results['writers'][f'writer_{writer_id}'] = {
-                        'success': result.get('success', False),
-                        'writer_id': writer_id,
-                        'primary_node': result.get('primary_node'),
-                        'replicated_to': result.get('replicated_to'),
-                        'pending_replication': result.get('pending_replication'),
-                        'duration': round(end_time - start_time, 4),
-                        'timestamp': datetime.now().isoformat()
-                    }
+                return f'writer_{writer_id}', {
+                    'success': result.get('success', False),
+                    'writer_id': writer_id,
+                    'primary_node': result.get('primary_node'),
+                    'replicated_to': result.get('replicated_to'),
+                    'pending_replication': result.get('pending_replication'),
+                    'duration': round(end_time - start_time, 4),
+                    'timestamp_ns': time.time_ns()
+                }
             except Exception as e:
                 logger.error(f"[Case #2] Writer {writer_id} error: {e}")
-                with lock:
-                    results['writers'][f'writer_{writer_id}'] = {
-                        'success': False,
-                        'error': str(e),
-                        'writer_id': writer_id
-                    }
+                return f'writer_{writer_id}', {
+                    'success': False,
+                    'error': str(e),
+                    'writer_id': writer_id
+                }
         
         def reader_transaction(reader_id):
             """Reader using application API during concurrent writes"""
             try:
                 start_barrier.wait()
-                time.sleep(0.02 * (reader_id + 1))
+                if simulate_delay:
+                    time.sleep(0.02 * (reader_id + 1))
                 
-                read_start_time = time.time()
+                read_start_time = time.perf_counter()
                 
                 # Each API call is independent (separate connections)
-                read1 = self.db.get_title_by_id(tconst)
-                read1_time = time.time()
+                read1 = self.db.get_title_by_id(tconst, use_cache=False)
+                read1_time = time.perf_counter()
+                reader_started.set()
                 
-                time.sleep(0.1)
+                delay = self._simulated_delay(simulate_delay)
                 
-                read2 = self.db.get_title_by_id(tconst)
-                read2_time = time.time()
-                end_time = time.time()
+                read2 = self.db.get_title_by_id(tconst, use_cache=False)
+                read2_time = time.perf_counter()
+                end_time = time.perf_counter()
                 
                 read_during_write = (read1_time - read_start_time) < 0.4
                 current_runtime = read1.get('runtime_minutes') if 'error' not in read1 else None
                 
-                saw_new_value = (current_runtime == new_data['runtime_minutes'] and 
-                                current_runtime != original_runtime)
+                saw_new_value = 'error' not in read1 and any(
+                    read1.get(column) == value for column, value in changed_items
+                )
                 
                 non_repeatable = read1 != read2
-                was_blocked = (end_time - read_start_time) > 0.3
+                was_blocked = (end_time - read_start_time - delay) > 0.3
                 
-                with lock:
-                    results['readers'][f'reader_{reader_id}'] = {
-                        'success': 'error' not in read1,
-                        'reader_id': reader_id,
-                        'read1': read1 if 'error' not in read1 else None,
-                        'read2': read2 if 'error' not in read2 else None,
-                        'original_runtime': original_runtime,
-                        'read_runtime': current_runtime,
-                        'read1_timestamp': round(read1_time - read_start_time, 4),
-                        'read2_timestamp': round(read2_time - read_start_time, 4),
-                        'read_during_write': read_during_write,
-                        'saw_new_value': saw_new_value,
-                        'values_changed_between_reads': non_repeatable,
-                        'blocked': was_blocked,
-                        'duration': round(end_time - read_start_time, 4),
-                        'timestamp': datetime.now().isoformat()
-                    }
+                return f'reader_{reader_id}', {
+                    'success': 'error' not in read1,
+                    'reader_id': reader_id,
+                    'read1': read1 if 'error' not in read1 else None,
+                    'read2': read2 if 'error' not in read2 else None,
+                    'original_runtime': original_runtime,
+                    'read_runtime': current_runtime,
+                    'read1_timestamp': round(read1_time - read_start_time, 4),
+                    'read2_timestamp': round(read2_time - read_start_time, 4),
+                    'read_during_write': read_during_write,
+                    'saw_new_value': saw_new_value,
+                    'values_changed_between_reads': non_repeatable,
+                    'blocked': was_blocked,
+                    'duration': round(end_time - read_start_time - delay, 4),
+                    'timestamp_ns': time.time_ns()
+                }
             except Exception as e:
                 logger.error(f"[Case #2] Reader {reader_id} error: {e}")
-                with lock:
-                    results['readers'][f'reader_{reader_id}'] = {
-                        'success': False,
-                        'error': str(e),
-                        'reader_id': reader_id
-                    }
-        
-        threads = []
-        
-        for i in range(2):
-            t = threading.Thread(target=writer_transaction, args=(i,))
-            threads.append(t)
-            t.start()
-        
-        for i in range(2):
-            t = threading.Thread(target=reader_transaction, args=(i,))
-            threads.append(t)
-            t.start()
-        
-        for t in threads:
-            t.join()
-        
-        time.sleep(0.5)  # Wait for replication
-        
-        results['final_values']['node1'] = self.db.get_title_by_id(tconst)
-        
-        fragment_node = 'node2' if title_type == 'movie' else 'node3'
-        conn = self.db.get_connection(fragment_node)
-        if conn:
-            try:
-                cursor = conn.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM titles WHERE tconst = %s", (tconst,))
-                results['final_values'][fragment_node] = cursor.fetchone()
-            except Exception as e:
-                results['final_values'][fragment_node] = {'error': str(e)}
-            finally:
-                conn.close()
+                return f'reader_{reader_id}', {
+                    'success': False,
+                    'error': str(e),
+                    'reader_id': reader_id
+                }
+        
+        outcomes = self._run_concurrently(
+            [(writer_transaction, i) for i in range(2)] +
+            [(reader_transaction, i) for i in range(2)]
+        )
+        results['writers'] = _format_timestamps(dict(filter(None, outcomes[:2])))
+        results['readers'] = _format_timestamps(dict(filter(None, outcomes[2:])))
+        
+        fragment_node = self.replication_manager._get_primary_node(title_type)
+        results['final_values'] = self._read_final_values(tconst, fragment_node)
         
         successful_writers = [w for w in results['writers'].values() if w.get('success')]
         successful_readers = [r for r in results['readers'].values() if r.get('success')]
@@ -304,6 +426,7 @@ class ConcurrencyTester:
             'new_data': new_data,
             'results': results,
             'analysis': {
+                'read_mode': READ_MODE,
                 'writers_succeeded': len(successful_writers),
                 'readers_succeeded': len(successful_readers),
                 'values_changed_between_reads': values_changed,
@@ -343,30 +466,29 @@ class ConcurrencyTester:
                 {'tconst': tconst, 'data': {'runtime_minutes': runtime3}}
             ]
         
-        title = self.db.get_title_by_id(tconst)
+        if len(updates) > MAX_CONCURRENT_WRITERS:
+            return {'error': f'At most {MAX_CONCURRENT_WRITERS} concurrent updates are supported'}
+        
+        title = self.db.get_title_by_id(tconst, use_cache=False)
         if 'error' in title:
             return {'error': f'Title {tconst} not found'}
         
         title_type = title.get('title_type')
-        fragment_node = 'node2' if title_type == 'movie' else 'node3'
+        fragment_node = self.replication_manager._get_primary_node(title_type)
         
         results = {
             'writers': {},
             'final_values': {},
             'conflicts': []
         }
-        lock = threading.Lock()
         
-        start_barrier = threading.Barrier(len(updates))
+        start_barrier = SpinBarrier(len(updates), timeout=BARRIER_TIMEOUT)
         
-        def concurrent_writer(update_payload, writer_id):
+        def concurrent_writer(tconst_target, data_to_write, writer_id):
             """Writer using replication_manager (production code)"""
             try:
                 start_barrier.wait()
-                start_time = time.time()
-                
-                tconst_target = update_payload.get('tconst')
-                data_to_write = update_payload.get('data', {})
+                start_time = time.perf_counter()
                 
                 logger.info(f"[Case #3] Writer {writer_id} calling replication_manager.update_title()")
                 
@@ -376,68 +498,55 @@ class ConcurrencyTester:
                     isolation_level
                 )
                 
-                end_time = time.time()
+                end_time = time.perf_counter()
                 
                 logger.info(f"[Case #3] Writer {writer_id} completed: {result.get('success')}")
                 
-                with lock:
-                    results['writers'][f'writer_{writer_id}'] = {
-                        'success': result.get('success', False),
-                        'writer_id': writer_id,
-                        'data_written': data_to_write,
-                        'primary_node': result.get('primary_node'),
-                        'replicated_to': result.get('replicated_to'),
-                        'pending_replication': result.get('pending_replication'),
-                        'duration': round(end_time - start_time, 4),
-                        'waited_for_lock': end_time - start_time > 0.2,
-                        'timestamp': datetime.now().isoformat()
-                    }
+                # update_title reports per-node outcomes; a lock conflict on the
+                # primary can still end in success through the central fallback
+                node_errors = [r for r in result.get('results', {}).values() if not r.get('success')]
+                errnos = {r.get('errno') for r in node_errors}
+                
+                return f'writer_{writer_id}', {
+                    'success': result.get('success', False),
+                    'error': result.get('error') or (node_errors[0]['error'] if node_errors else None),
+                    'writer_id': writer_id,
+                    'data_written': data_to_write,
+                    'primary_node': result.get('primary_node'),
+                    'replicated_to': result.get('replicated_to'),
+                    'pending_replication': result.get('pending_replication'),
+                    'duration': round(end_time - start_time, 4),
+                    'waited_for_lock': end_time - start_time > 0.2,
+                    'deadlock': errorcode.ER_LOCK_DEADLOCK in errnos,
+                    'lock_timeout': errorcode.ER_LOCK_WAIT_TIMEOUT in errnos,
+                    'timestamp_ns': time.time_ns()
+                }
             except Exception as e:
                 error_msg = str(e)
                 logger.error(f"[Case #3] Writer {writer_id} failed: {error_msg}")
                 
-                with lock:
-                    results['writers'][f'writer_{writer_id}'] = {
-                        'success': False,
-                        'error': error_msg,
-                        'writer_id': writer_id,
-                        'deadlock': 'deadlock' in error_msg.lower(),
-                        'lock_timeout': 'timeout' in error_msg.lower()
-                    }
-                    
-                    if 'deadlock' in error_msg.lower():
-                        results['conflicts'].append({
-                            'type': 'deadlock',
-                            'writer': writer_id,
-                            'message': error_msg
-                        })
-        
-        threads = []
-        for i, update_config in enumerate(updates):
-            t = threading.Thread(target=concurrent_writer, args=(update_config, i))
-            threads.append(t)
-            t.start()
-        
-        for t in threads:
-            t.join()
-        
-        time.sleep(0.5)  # Wait for replication
-        
-        results['final_values']['node1'] = self.db.get_title_by_id(tconst)
-        
-        conn_frag = self.db.get_connection(fragment_node)
-        if conn_frag:
-            try:
-                cursor = conn_frag.cursor(dictionary=True)
-                cursor.execute("SELECT * FROM titles WHERE tconst = %s", (tconst,))
-                results['final_values'][fragment_node] = cursor.fetchone()
-            except Exception as e:
-                results['final_values'][fragment_node] = {'error': str(e)}
-            finally:
-                conn_frag.close()
+                errno = getattr(e, 'errno', None)
+                return f'writer_{writer_id}', {
+                    'success': False,
+                    'error': error_msg,
+                    'writer_id': writer_id,
+                    'deadlock': errno == errorcode.ER_LOCK_DEADLOCK,
+                    'lock_timeout': errno == errorcode.ER_LOCK_WAIT_TIMEOUT
+                }
+        
+        results['writers'] = _format_timestamps(dict(filter(None, self._run_concurrently(
+            # Payloads are unpacked here so the timed section after the barrier is only the update
+            [(concurrent_writer, update_config.get('tconst'), update_config.get('data', {}), i)
+             for i, update_config in enumerate(updates)]
+        ))))
+        results['conflicts'] = [
+            {'type': 'deadlock', 'writer': w['writer_id'], 'message': w['error']}
+            for w in results['writers'].values() if w.get('deadlock')
+        ]
+        
+        results['final_values'] = self._read_final_values(tconst, fragment_node)
         
         successful_writers = [w for w in results['writers'].values() if w.get('success')]
-        failed_writers = [w for w in results['writers'].values() if not w.get('success')]
         deadlocks = len(results['conflicts'])
         blocking_occurred = any(w.get('waited_for_lock', False) for w in successful_writers)
         
@@ -459,7 +568,7 @@ class ConcurrencyTester:
             'results': results,
             'analysis': {
                 'successful_writes': len(successful_writers),
-                'failed_writes': len(failed_writers),
+                'failed_writes': len(results['writers']) - len(successful_writers),
                 'deadlocks_detected': deadlocks,
                 'blocking_occurred': blocking_occurred,
                 'final_state_consistent_across_nodes': nodes_consistent,
@@ -475,124 +584,105 @@ class ConcurrencyTester:
     
     def _explain_read_behavior(self, isolation_level, consistent, repeatable):
         """Explain concurrent read behavior at application level"""
-        parts = []
-        
-        parts.append(f'Application-level reads through get_title_by_id()')
-        
-        if consistent:
-            parts.append('✓ Cross-node data consistent')
-        else:
-            parts.append('⚠ Cross-node inconsistency detected')
-        
-        if repeatable:
-            parts.append('✓ Values stable during test window')
-        else:
-            parts.append('⚠ Values changed between reads (timing-dependent)')
-        
-        parts.append('No reader blocking (expected for read operations)')
-        
-        return ' | '.join(parts)
+        return ' | '.join((
+            'Application-level reads through get_title_by_id() (uncached)',
+            '✓ Cross-node data consistent' if consistent else '⚠ Cross-node inconsistency detected',
+            '✓ Values stable during test window' if repeatable
+            else '⚠ Values changed between reads (timing-dependent)',
+            'No reader blocking (expected for read operations)'
+        ))
     
     def _explain_read_write_app_level(self, isolation_level, values_changed, blocking, nodes_consistent):
         """Explain read-write behavior at application level"""
-        parts = []
-        
-        parts.append(f'{isolation_level}: Application-level testing')
-        
-        if values_changed:
-            parts.append('⚠ Readers saw different values between reads')
-            parts.append('(Expected: each API call is independent transaction)')
-        else:
-            parts.append('✓ Readers saw consistent values')
-        
-        if blocking:
-            parts.append('⚠ Blocking detected')
-        else:
-            parts.append('✓ No blocking (writers commit immediately)')
-        
-        if nodes_consistent:
-            parts.append('✓ Replication maintained cross-node consistency')
-        else:
-            parts.append('✗ Cross-node inconsistency (replication issue)')
-        
-        return ' | '.join(parts)
+        return ' | '.join((
+            f'{isolation_level}: Application-level testing',
+            '⚠ Readers saw different values between reads | (Expected: each API call is independent transaction)'
+            if values_changed else '✓ Readers saw consistent values',
+            '⚠ Blocking detected' if blocking else '✓ No blocking (writers commit immediately)',
+            '✓ Replication maintained cross-node consistency' if nodes_consistent
+            else '✗ Cross-node inconsistency (replication issue)'
+        ))
     
     def _explain_write_behavior(self, isolation_level, successful, deadlocks, blocking, consistent):
         """Explain concurrent write behavior"""
-        parts = []
-        
-        parts.append(f'{isolation_level}: {successful} successful write(s)')
-        
-        if deadlocks > 0:
-            parts.append(f'⚠ {deadlocks} deadlock(s) - MySQL conflict detection')
-        
-        if blocking:
-            parts.append('✓ Lock waiting observed (serialization)')
-        
-        if consistent:
-            parts.append('✓ Replication maintained cross-node consistency')
-        else:
-            parts.append('✗ Cross-node inconsistency detected')
-        
-        parts.append('All writes used production replication code path')
-        
-        return ' | '.join(parts)
+        # Deadlock and blocking notes only appear when they happened
+        return ' | '.join(filter(None, (
+            f'{isolation_level}: {successful} successful write(s)',
+            f'⚠ {deadlocks} deadlock(s) - MySQL conflict detection' if deadlocks > 0 else None,
+            '✓ Lock waiting observed (serialization)' if blocking else None,
+            '✓ Replication maintained cross-node consistency' if consistent
+            else '✗ Cross-node inconsistency detected',
+            'All writes used production replication code path'
+        )))
     
     def simulate_failure(self, scenario, node):
         """Guide for simulating failure scenarios (for Step 4 - Recovery)"""
         if scenario == 'fragment_to_central':
-            return {
-                'scenario': 'Case #1: Central node failure during replication',
-                'description': 'Fragment write succeeds, but central replication fails',
-                'steps': [
-                    '1. Stop node1 container:',
-                    '2. Insert title via POST /title',
-                    '3. Check queue: GET /recovery/status',
-                    '4. Restart node1:',
-                    '5. Recover: POST /test/failure/central-recovery'
-                ],
-                'codes': [
-                    'docker stop node1-central',
-                    'ssh root@ccscloud.dlsu.edu.ph -p 60457',
-                    'systemctl stop mysql',
+            guide = _FRAGMENT_TO_CENTRAL_GUIDE
+        elif scenario == 'central_to_fragment':
+            guide = _CENTRAL_TO_FRAGMENT_GUIDES.get(node) or _central_to_fragment_guide(node)
+        else:
+            return dict(_UNKNOWN_SCENARIO)
+        
+        return {
+            **guide,
+            'current_pending': self.replication_manager.recovery_handler.get_pending_count()
+        }
 
-                    'docker start node1-central',
-                    'ssh root@ccscloud.dlsu.edu.ph -p 60457',
-                    'systemctl start mysql',
-                ],
-                'expected': 'Insert succeeds on fragment, queued for central',
-                'current_pending': self.replication_manager.recovery_handler.get_pending_count()
-            }
 
-            
-        elif scenario == 'central_to_fragment':
-            node_name = f'{node}-movies' if node == 'node2' else f'{node}-nonmovies'
-            port = f'60458' if node == 'node2' else f'60459'
-            return {
-                'scenario': 'Case #3: Fragment node failure during replication',
-                'description': 'Central write succeeds (fallback), fragment replication queued',
-                'steps': [
-                    f'1. Stop {node} container:',
-                    '2. Insert a movie via POST /title (will use central as fallback)',
-                    '3. Check pending queue: GET /recovery/status',
-                    f'4. Restart {node}',
-                    f'5. Trigger recovery: POST /test/failure/fragment-recovery with {{"node": "{node}"}}'
-                ],
-                'codes': [
-                    f'docker stop {node_name}',
-                    f'ssh root@ccscloud.dlsu.edu.ph -p {port}',
-                    'systemctl stop mysql',
+# Static parts of the simulate_failure guides, built once at import
 
-                    f'docker start {node_name}',
-                    f'ssh root@ccscloud.dlsu.edu.ph -p {port}',
-                    'systemctl start mysql',
-                ],
-                'expected': 'Insert succeeds on central, queued for fragment',
-                'current_pending': self.replication_manager.recovery_handler.get_pending_count()
-            }
-        
-        else:
-            return {
-                'error': 'Unknown scenario',
-                'valid_scenarios': ['fragment_to_central', 'central_to_fragment']
-            }
\ No newline at end of file
+_FRAGMENT_TO_CENTRAL_GUIDE = {
+    'scenario': 'Case #1: Central node failure during replication',
+    'description': 'Fragment write succeeds, but central replication fails',
+    'steps': [
+        '1. Stop node1 container:',
+        '2. Insert title via POST /title',
+        '3. Check queue: GET /recovery/status',
+        '4. Restart node1:',
+        '5. Recover: POST /test/failure/central-recovery'
+    ],
+    'codes': [
+        'docker stop node1-central',
+        'ssh root@ccscloud.dlsu.edu.ph -p 60457',
+        'systemctl stop mysql',
+
+        'docker start node1-central',
+        'ssh root@ccscloud.dlsu.edu.ph -p 60457',
+        'systemctl start mysql',
+    ],
+    'expected': 'Insert succeeds on fragment, queued for central'
+}
+
+def _central_to_fragment_guide(node):
+    """Fragment-failure guide for one fragment node"""
+    node_name = f'{node}-movies' if node == 'node2' else f'{node}-nonmovies'
+    port = f'60458' if node == 'node2' else f'60459'
+    return {
+        'scenario': 'Case #3: Fragment node failure during replication',
+        'description': 'Central write succeeds (fallback), fragment replication queued',
+        'steps': [
+            f'1. Stop {node} container:',
+            '2. Insert a movie via POST /title (will use central as fallback)',
+            '3. Check pending queue: GET /recovery/status',
+            f'4. Restart {node}',
+            f'5. Trigger recovery: POST /test/failure/fragment-recovery with {{"node": "{node}"}}'
+        ],
+        'codes': [
+            f'docker stop {node_name}',
+            f'ssh root@ccscloud.dlsu.edu.ph -p {port}',
+            'systemctl stop mysql',
+
+            f'docker start {node_name}',
+            f'ssh root@ccscloud.dlsu.edu.ph -p {port}',
+            'systemctl start mysql',
+        ],
+        'expected': 'Insert succeeds on central, queued for fragment'
+    }
+
+_CENTRAL_TO_FRAGMENT_GUIDES = {node: _central_to_fragment_guide(node) for node in ('node2', 'node3')}
+
+_UNKNOWN_SCENARIO = {
+    'error': 'Unknown scenario',
+    'valid_scenarios': ('fragment_to_central', 'central_to_fragment')
+}
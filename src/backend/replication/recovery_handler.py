@@ -1,11 +1,35 @@
 import logging
-import json
+import orjson
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
+from mysql.connector import Error
+from db_manager import TITLES_WRITE_PATTERN
 
 logger = logging.getLogger(__name__)
 
+# Pending replications replayed per target transaction (one commit per batch)
+RECOVERY_BATCH_SIZE = 500
+
+# How long a node liveness probe is trusted (offline verdicts a little longer,
+# since probing a dead node costs a full connect timeout)
+LIVENESS_TTL_ONLINE = 2
+LIVENESS_TTL_OFFLINE = 5
+
+# After an early wake-up, pause this long so a burst of newly queued
+# replications (e.g. while a node is down) coalesces into one pass
+RETRY_WAKE_MIN_GAP = 0.5
+
+# After a pass finds every source log empty, skip the per-node queries until a
+# replication is queued or this long has passed (a backstop for entries that
+# were not logged through this process)
+IDLE_RESCAN_INTERVAL = 60
+
+# Every node keeps its own transaction_log (bidirectional replication)
+SOURCE_NODES = ('node1', 'node2', 'node3')
+
 class RecoveryHandler:
     def __init__(self, db_manager, transaction_logger):
         self.db = db_manager
@@ -13,65 +37,203 @@ class RecoveryHandler:
         self.retry_interval = 10  # retry every 10 seconds
         self.is_running = False
         self.retry_thread = None
+        # Makes start/stop check-and-set atomic (the API can toggle retry concurrently)
+        self._state_lock = threading.Lock()
+        # Ends the retry loop's wait early: set on stop and by notify_pending
+        self._wake_event = threading.Event()
+        # One replay pass at a time, so the background loop and a manual
+        # recovery never apply the same pending entries twice
+        self._replay_lock = threading.Lock()
+        # node -> (online, expires_at) from the last check_node probe
+        self._liveness = {}
+        # Idle skipping: no pass needed before _idle_until unless notify_pending
+        # has flagged new work since the last pass started
+        self._idle_until = 0
+        self._pending_notified = False
     
     def start_automatic_retry(self):
         """Start background thread for automatic retry"""
-        if self.is_running:
-            logger.warning("Automatic retry is already running")
-            return
-        
-        self.is_running = True
-        self.retry_thread = threading.Thread(target=self._retry_loop, daemon=True)
-        self.retry_thread.start()
+        with self._state_lock:
+            if self.is_running:
+                logger.warning("Automatic retry is already running")
+                return
+            
+            self.is_running = True
+            self._idle_until = 0
+            self._wake_event.clear()
+            self.retry_thread = threading.Thread(target=self._retry_loop, daemon=True)
+            self.retry_thread.start()
         logger.info(f"Automatic retry started (interval: {self.retry_interval}s)")
     
     def stop_automatic_retry(self):
         """Stop background retry thread"""
-        self.is_running = False
-        if self.retry_thread:
-            self.retry_thread.join(timeout=5)
+        with self._state_lock:
+            self.is_running = False
+            self._wake_event.set()
+            if self.retry_thread:
+                self.retry_thread.join(timeout=5)
+                self.retry_thread = None
         logger.info("Automatic retry stopped")
     
+    def notify_pending(self):
+        """Wake the retry loop for a new pending replication (coalesces repeated calls)"""
+        self._pending_notified = True
+        self._wake_event.set()
+    
     def _retry_loop(self):
         """Background loop that retries failed replications"""
         while self.is_running:
-            try:
-                # Check ALL nodes for pending replications (bidirectional)
-                # node1 = central, node2/node3 = fragments
-                for source_node in ['node1', 'node2', 'node3']:
-                    self._process_pending_replications(source_node)
-                
-                time.sleep(self.retry_interval)
-                
-            except Exception as e:
-                logger.error(f"Error in retry loop: {e}")
-                time.sleep(self.retry_interval)
+            if self._pending_notified or time.monotonic() >= self._idle_until:
+                self._run_retry_pass()
+            
+            if self._wake_event.wait(self.retry_interval) and self.is_running:
+                time.sleep(RETRY_WAKE_MIN_GAP)
+            self._wake_event.clear()
+    
+    def _run_retry_pass(self):
+        """One pass over every source log; goes idle if all of them were empty"""
+        self._pending_notified = False
+        try:
+            # Check ALL nodes for pending replications (bidirectional)
+            # node1 = central, node2/node3 = fragments
+            # Sources are processed in parallel so a slow or offline node
+            # doesn't hold up the others
+            with self._replay_lock, ThreadPoolExecutor(max_workers=len(SOURCE_NODES)) as executor:
+                # Probe every node up front so the pass's target checks hit the cache
+                online = list(executor.map(lambda node: self._is_alive(node, refresh=True), SOURCE_NODES))
+                # list() waits for every source and re-raises the first error
+                pending = list(executor.map(self._process_pending_replications, SOURCE_NODES))
+            
+            # An offline source may still hold entries, so only a fully
+            # reachable, fully empty pass counts as idle
+            if all(online) and not any(pending) and not self._pending_notified:
+                self._idle_until = time.monotonic() + IDLE_RESCAN_INTERVAL
+            
+        except Exception as e:
+            logger.error(f"Error in retry loop: {e}")
+    
+    def _is_alive(self, node_name, refresh=False):
+        """check_node, reusing a recent verdict unless refresh is set"""
+        cached = self._liveness.get(node_name)
+        now = time.monotonic()
+        if cached and not refresh and now < cached[1]:
+            return cached[0]
+        
+        online = self.db.check_node(node_name)
+        ttl = LIVENESS_TTL_ONLINE if online else LIVENESS_TTL_OFFLINE
+        self._liveness[node_name] = (online, now + ttl)
+        return online
     
     def _process_pending_replications(self, source_node):
-        """Process all pending replications from a source node"""
+        """Process all pending replications from a source node; returns how many were found"""
         pending = self.transaction_logger.get_pending_replications(source_node)
         
         if not pending:
-            return
+            return 0
         
         logger.info(f"Processing {len(pending)} pending replications from {source_node}")
         
+        # Group by target, keeping created_at order within each target
+        by_target = {}
         for transaction in pending:
-            self._retry_single_transaction(source_node, transaction)
+            by_target.setdefault(transaction['target_node'], []).append(transaction)
+        
+        for target_node, transactions in by_target.items():
+            self._replay_pending(source_node, target_node, transactions)
+        
+        return len(pending)
+    
+    def _replay_pending(self, source_node, target_node, transactions):
+        """
+        Replay pending replications to one target, RECOVERY_BATCH_SIZE per transaction.
+        
+        A batch that fails is rolled back and retried one transaction at a
+        time, so a single bad entry only costs its own retry count.
+        
+        Returns:
+            (recovered, failed) counts
+        """
+        if not self._is_alive(target_node):
+            logger.warning(f"Target {target_node} still offline, skipping {len(transactions)} retries")
+            return 0, len(transactions)
+        
+        recovered = 0
+        failed = 0
+        
+        for start in range(0, len(transactions), RECOVERY_BATCH_SIZE):
+            batch = transactions[start:start + RECOVERY_BATCH_SIZE]
+            
+            if self._replay_batch(source_node, target_node, batch):
+                recovered += len(batch)
+                continue
+            
+            for transaction in batch:
+                if self._retry_single_transaction(source_node, transaction):
+                    recovered += 1
+                else:
+                    failed += 1
+        
+        return recovered, failed
+    
+    def _replay_batch(self, source_node, target_node, transactions):
+        """Apply a batch of replications in one transaction on the target; True if committed"""
+        conn = self.db.get_connection(target_node)
+        if not conn:
+            return False
+        
+        cursor = None
+        try:
+            conn.start_transaction()
+            # Prepared cursor: each run of entries sharing a statement is
+            # parsed once on the target and then executed with bound params
+            cursor = conn.cursor(prepared=True)
+            for query, run in groupby(transactions, key=lambda t: t['query_text']):
+                cursor.executemany(query, [self._parse_params(t) for t in run])
+            conn.commit()
+        except Error as e:
+            conn.rollback()
+            logger.warning(
+                f"Batch replay of {len(transactions)} replications to {target_node} failed, "
+                f"retrying individually: {e}"
+            )
+            return False
+        finally:
+            # Pooled sessions aren't reset on return, so deallocate the
+            # server-side statement before handing the connection back
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Error:
+                    pass  # Session is gone; its statements went with it
+            conn.close()
+        
+        if any(TITLES_WRITE_PATTERN.match(t['query_text']) for t in transactions):
+            self.db.invalidate_caches()
+        
+        self.transaction_logger.mark_replicated(
+            source_node, [t['transaction_id'] for t in transactions]
+        )
+        logger.info(
+            f"✓ REPLICATION SUCCESS: {len(transactions)} replications "
+            f"({source_node} → {target_node}) in one batch"
+        )
+        return True
+    
+    def _parse_params(self, transaction):
+        """Parse a logged transaction's JSON params back to a tuple"""
+        try:
+            return tuple(orjson.loads(transaction['query_params'])) if transaction['query_params'] else ()
+        except (TypeError, orjson.JSONDecodeError):
+            return ()
     
     def _retry_single_transaction(self, source_node, transaction):
-        """Retry a single failed replication"""
+        """Retry a single failed replication; True if it was applied"""
         transaction_id = transaction['transaction_id']
         target_node = transaction['target_node']
         operation_type = transaction['operation_type']
         record_id = transaction['record_id']
         query = transaction['query_text']
-        
-        # Parse JSON params back to tuple
-        try:
-            params = tuple(json.loads(transaction['query_params'])) if transaction['query_params'] else ()
-        except:
-            params = ()
+        params = self._parse_params(transaction)
         
         logger.info(
             f"Retrying {operation_type} for {record_id}: "
@@ -79,29 +241,24 @@ class RecoveryHandler:
         )
         
         # Check if target node is online before attempting
-        if not self.db.check_node(target_node):
+        if not self._is_alive(target_node):
             logger.warning(f"Target {target_node} still offline, skipping retry for {record_id}")
-            return
-        
-        # Attempt replication
-        result = self.db.execute_query(target_node, query, params)
+            return False
         
-        # Update retry count
-        self.transaction_logger.increment_retry_count(source_node, transaction_id)
+        # Attempt replication (logged statements come from ReplicationManager's fixed shapes)
+        result = self.db.execute_query(target_node, query, params, prepared=True)
         
+        # Retry count and outcome are written together
         if result['success']:
-            self.transaction_logger.update_log_status(
-                source_node, 
-                transaction_id, 
-                'SUCCESS'
-            )
+            self.transaction_logger.record_retry(source_node, transaction_id, 'SUCCESS')
             logger.info(
                 f"✓ REPLICATION SUCCESS: {operation_type} for {record_id} "
                 f"({source_node} → {target_node})"
             )
+            return True
         else:
             if transaction['retry_count'] + 1 >= transaction['max_retries']:
-                self.transaction_logger.update_log_status(
+                self.transaction_logger.record_retry(
                     source_node,
                     transaction_id,
                     'FAILED',
@@ -112,10 +269,14 @@ class RecoveryHandler:
                     f"after {transaction['max_retries']} attempts"
                 )
             else:
+                self.transaction_logger.record_retry(
+                    source_node, transaction_id, 'PENDING', error_msg=result.get('error')
+                )
                 logger.warning(
                     f"⚠ Retry {transaction['retry_count'] + 1} failed for {record_id}. "
                     f"Will retry again. Error: {result.get('error')}"
                 )
+            return False
     
     def recover_node(self, node_name):
         """
@@ -123,8 +284,8 @@ class RecoveryHandler:
         """
         logger.info(f"Manual recovery triggered for {node_name}")
         
-        # Check if target node is online
-        if not self.db.check_node(node_name):
+        # Check if target node is online (always probed: the user just restarted it)
+        if not self._is_alive(node_name, refresh=True):
             return {
                 'node': node_name,
                 'recovered': 0,
@@ -132,127 +293,92 @@ class RecoveryHandler:
                 'message': f'{node_name} is still offline. Cannot recover.'
             }
         
+        with self._replay_lock:
+            recovered, failed = self._recover_from_sources(node_name)
+        
+        return {
+            'node': node_name,
+            'recovered': recovered,
+            'failed': failed,
+            'message': (
+                f'Manual recovery complete: {recovered} transactions recovered, '
+                f'{failed} still pending/failed'
+            )
+        }
+    
+    def _recover_from_sources(self, node_name):
+        """Replay every source node's pending replications to node_name; (recovered, failed)"""
         recovered = 0
         failed = 0
         
         # Check ALL source nodes for replications targeting this node
-        for source_node in ['node1', 'node2', 'node3']:
+        for source_node in SOURCE_NODES:
             if source_node == node_name:
                 continue  # Skip self
             
-            conn = self.db.get_connection(source_node)
-            if not conn:
-                logger.warning(f"Cannot access {source_node} for recovery check")
-                continue
-            
-            try:
-                cursor = conn.cursor(dictionary=True)
-                query = """
-                    SELECT * FROM transaction_log
-                    WHERE target_node = %s
-                      AND status = 'PENDING'
-                      AND retry_count < max_retries
-                    ORDER BY created_at ASC
-                """
-                cursor.execute(query, (node_name,))
-                transactions = cursor.fetchall()
+            # Keyset pagination: one page in memory at a time, and the source
+            # connection is returned to the pool while a page is replayed
+            after = None
+            while True:
+                transactions = self._fetch_pending_page(source_node, node_name, after)
+                if not transactions:
+                    break
                 
                 logger.info(
                     f"Found {len(transactions)} pending replications "
                     f"from {source_node} to {node_name}"
                 )
                 
-                for transaction in transactions:
-                    self._retry_single_transaction(source_node, transaction)
-                    
-                    # Check if it succeeded
-                    cursor.execute(
-                        "SELECT status FROM transaction_log WHERE transaction_id = %s",
-                        (transaction['transaction_id'],)
-                    )
-                    result = cursor.fetchone()
-                    
-                    if result and result['status'] == 'SUCCESS':
-                        recovered += 1
-                    else:
-                        failed += 1
+                page_recovered, page_failed = self._replay_pending(source_node, node_name, transactions)
+                recovered += page_recovered
+                failed += page_failed
                 
-            except Exception as e:
-                logger.error(f"Error during recovery from {source_node}: {e}")
-            finally:
-                conn.close()
+                if len(transactions) < RECOVERY_BATCH_SIZE:
+                    break
+                last = transactions[-1]
+                after = (last['created_at'], last['log_id'])
         
-        return {
-            'node': node_name,
-            'recovered': recovered,
-            'failed': failed,
-            'message': (
-                f'Manual recovery complete: {recovered} transactions recovered, '
-                f'{failed} still pending/failed'
-            )
-        }
+        return recovered, failed
     
-    def get_pending_summary(self):
-        """Get summary of pending replications across all nodes"""
-        summary = {}
-        total_pending = 0
+    def _fetch_pending_page(self, source_node, target_node, after=None):
+        """
+        Next RECOVERY_BATCH_SIZE pending entries for target_node in replay order.
+        
+        after is the (created_at, log_id) of the last entry already seen; paging on
+        it rather than on status means entries that stay PENDING after a failed
+        retry aren't fetched again. Returns [] if the source can't be read.
+        """
+        params = [target_node]
+        keyset = ''
+        if after:
+            keyset = 'AND (created_at > %s OR (created_at = %s AND log_id > %s))'
+            params += [after[0], after[0], after[1]]
+        params.append(RECOVERY_BATCH_SIZE)
+        
+        query = f"""
+            SELECT * FROM transaction_log
+            WHERE target_node = %s
+              AND status = 'PENDING'
+              AND retry_count < max_retries
+              {keyset}
+            ORDER BY created_at ASC, log_id ASC
+            LIMIT %s
+        """
         
+        result = self.db.execute_select(source_node, query, tuple(params))
+        if not result['success']:
+            logger.warning(f"Cannot access {source_node} for recovery check: {result['error']}")
+        return result['data']
+    
+    def get_pending_summary(self):
+        """Get summary of pending replications across all nodes (queried in parallel)"""
         # Check ALL nodes (bidirectional support)
-        for source_node in ['node1', 'node2', 'node3']:
-            conn = self.db.get_connection(source_node)
-            if not conn:
-                summary[source_node] = {
-                    'status': 'offline',
-                    'pending_count': 0,
-                    'failed_count': 0
-                }
-                continue
-            
-            try:
-                cursor = conn.cursor(dictionary=True)
-                
-                # Count pending
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM transaction_log 
-                    WHERE status = 'PENDING' AND retry_count < max_retries
-                """)
-                pending_count = cursor.fetchone()['count']
-                
-                # Count failed
-                cursor.execute("""
-                    SELECT COUNT(*) as count 
-                    FROM transaction_log 
-                    WHERE status = 'FAILED' OR (status = 'PENDING' AND retry_count >= max_retries)
-                """)
-                failed_count = cursor.fetchone()['count']
-                
-                # Get breakdown by target
-                cursor.execute("""
-                    SELECT target_node, COUNT(*) as count
-                    FROM transaction_log
-                    WHERE status = 'PENDING' AND retry_count < max_retries
-                    GROUP BY target_node
-                """)
-                pending_by_target = {row['target_node']: row['count'] for row in cursor.fetchall()}
-                
-                summary[source_node] = {
-                    'status': 'online',
-                    'pending_count': pending_count,
-                    'failed_count': failed_count,
-                    'pending_by_target': pending_by_target
-                }
-                
-                total_pending += pending_count
-                
-            except Exception as e:
-                logger.error(f"Error getting summary from {source_node}: {e}")
-                summary[source_node] = {
-                    'status': 'error',
-                    'error': str(e)
-                }
-            finally:
-                conn.close()
+        with ThreadPoolExecutor(max_workers=len(SOURCE_NODES)) as executor:
+            summary = dict(zip(SOURCE_NODES, executor.map(self._node_pending_summary, SOURCE_NODES)))
+        total_pending = sum(
+            node_summary['pending_count'] for node_summary in summary.values()
+            if node_summary.get('status') == 'online'
+        )
         
         return {
             'total_pending': total_pending,
@@ -261,6 +387,50 @@ class RecoveryHandler:
             'automatic_retry_active': self.is_running
         }
     
+    def _node_pending_summary(self, source_node):
+        """Pending/failed counts from one node's transaction_log"""
+        conn = self.db.get_connection(source_node)
+        if not conn:
+            return {
+                'status': 'offline',
+                'pending_count': 0,
+                'failed_count': 0
+            }
+        
+        try:
+            cursor = conn.cursor(dictionary=True)
+            
+            # Pending and failed counts per target in one pass over the log
+            cursor.execute("""
+                SELECT target_node,
+                       SUM(status = 'PENDING' AND retry_count < max_retries) as pending,
+                       SUM(status = 'FAILED' OR (status = 'PENDING' AND retry_count >= max_retries)) as failed
+                FROM transaction_log
+                GROUP BY target_node
+            """)
+            rows = cursor.fetchall()
+            
+            # SUM() comes back as DECIMAL
+            pending_by_target = {row['target_node']: int(row['pending']) for row in rows if row['pending']}
+            pending_count = sum(pending_by_target.values())
+            failed_count = sum(int(row['failed']) for row in rows)
+            
+            return {
+                'status': 'online',
+                'pending_count': pending_count,
+                'failed_count': failed_count,
+                'pending_by_target': pending_by_target
+            }
+            
+        except Exception as e:
+            logger.error(f"Error getting summary from {source_node}: {e}")
+            return {
+                'status': 'error',
+                'error': str(e)
+            }
+        finally:
+            conn.close()
+    
     def get_pending_count(self):
         """Quick count of all pending replications"""
         summary = self.get_pending_summary()
@@ -4,19 +4,287 @@ from .transaction_logger import TransactionLogger
 from .recovery_handler import RecoveryHandler
 from .concurrency_tester import ConcurrencyTester
 import threading
+import time
+from cachetools import TTLCache
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from mysql.connector import errorcode
 
 logger = logging.getLogger(__name__)
 
+# Holds every title; each write is mirrored between it and the title's fragment
+CENTRAL_NODE = 'node1'
+
+INSERT_TITLE_QUERY = (
+    "INSERT INTO titles (tconst, title_type, primary_title, start_year, runtime_minutes, genres) "
+    "VALUES (%s, %s, %s, %s, %s, %s)"
+)
+# Replicated inserts carry the source node's last_updated explicitly
+REPLICATE_INSERT_QUERY = (
+    "INSERT INTO titles (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated) "
+    "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+)
+DELETE_TITLE_QUERY = "DELETE FROM titles WHERE tconst = %s"
+
+# Read back on the written node so replicas get the exact server-set timestamp
+LAST_UPDATED_QUERY = "SELECT last_updated FROM titles WHERE tconst = %s"
+
+# Columns update_title may set; their names are interpolated into the UPDATE
+UPDATABLE_COLUMNS = ('title_type', 'primary_title', 'start_year', 'runtime_minutes', 'genres')
+
+# Write routing cache: tconst -> title_type. Unlike get_title_by_id's cache it
+# survives titles writes, so back-to-back updates skip the lookup
+TITLE_TYPE_CACHE_SIZE = 100000
+TITLE_TYPE_CACHE_TTL = 300
+
+# 'sync': the central replica is written before the call returns.
+# 'async': only the primary is written; the central write is logged PENDING and
+# applied by the recovery handler's retry loop (woken through on_pending)
+DURABILITY_MODES = ('sync', 'async')
+
+# Inserts are sync only: new IDs come from MAX(tconst) on central, which
+# wouldn't see a deferred insert yet, so the next insert would reuse its tconst
+INSERT_DURABILITY_MODES = ('sync',)
+
+# Circuit breaker for write targets: after this many consecutive connection
+# failures a node is skipped (writes go straight to their fallback) for the
+# cooldown, doubling after each failed half-open probe up to the max
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30
+CIRCUIT_MAX_COOLDOWN = 300
+
+# Failures that say the node itself is unreachable (not a statement error)
+CONNECTION_ERRNOS = frozenset((
+    errorcode.CR_CONN_HOST_ERROR, errorcode.CR_SERVER_GONE_ERROR, errorcode.CR_SERVER_LOST,
+))
+
+# Threads for replica writes issued alongside the primary write
+REPLICA_WRITE_WORKERS = 8
+
+@lru_cache(maxsize=None)
+def _update_query(columns, with_timestamp=False):
+    """
+    UPDATE titles statement for a column tuple, built once per column set.
+    
+    with_timestamp builds the replicated form: it sets last_updated explicitly
+    and only applies if the target's row isn't newer, so a late replay (async
+    or retried) can't roll back a newer write. Params: values, last_updated,
+    tconst, last_updated.
+    """
+    set_clauses = [f"{column} = %s" for column in columns]
+    if with_timestamp:
+        set_clauses.append("last_updated = %s")
+        return f"UPDATE titles SET {', '.join(set_clauses)} WHERE tconst = %s AND last_updated <= %s"
+    return f"UPDATE titles SET {', '.join(set_clauses)} WHERE tconst = %s"
+
 class ReplicationManager:
+    # Fragmentation policy: title_type -> fragment holding it (node1 holds everything)
+    _PRIMARY_BY_TYPE = {'movie': 'node2'}
+    _DEFAULT_PRIMARY = 'node3'
+    
     def __init__(self, db_manager):
         self.db = db_manager
         self.transaction_logger = TransactionLogger(db_manager)
         self.recovery_handler = RecoveryHandler(db_manager, self.transaction_logger)
+        # Newly queued replications get a retry pass right away instead of up to retry_interval later
+        self.transaction_logger.on_pending = self.recovery_handler.notify_pending
         self.concurrency_tester = ConcurrencyTester(db_manager, self)
         self._id_lock = threading.Lock()
+        self._title_types = TTLCache(maxsize=TITLE_TYPE_CACHE_SIZE, ttl=TITLE_TYPE_CACHE_TTL)
+        self._title_types_lock = threading.Lock()
+        # node -> [consecutive failures, open_until, cooldown]
+        self._circuits = {}
+        self._circuit_lock = threading.Lock()
+        self._replica_pool = ThreadPoolExecutor(
+            max_workers=REPLICA_WRITE_WORKERS, thread_name_prefix='replica-write'
+        )
     
     def _get_primary_node(self, title_type):
-        return 'node2' if title_type == 'movie' else 'node3'
+        return self._PRIMARY_BY_TYPE.get(title_type, self._DEFAULT_PRIMARY)
+    
+    def _circuit_open(self, node_name):
+        """
+        True while node_name's breaker is open. Once the cooldown expires one
+        caller is let through as a half-open probe; the rest keep skipping.
+        """
+        with self._circuit_lock:
+            circuit = self._circuits.get(node_name)
+            if not circuit or circuit[0] < CIRCUIT_FAILURE_THRESHOLD:
+                return False
+            now = time.monotonic()
+            if now < circuit[1]:
+                return True
+            circuit[1] = now + circuit[2]
+            return False
+    
+    def _record_reachability(self, node_name, reachable):
+        """Feed a write attempt's outcome to node_name's breaker"""
+        with self._circuit_lock:
+            if reachable:
+                if self._circuits.pop(node_name, None):
+                    logger.info(f"Circuit for {node_name} closed")
+                return
+            
+            circuit = self._circuits.setdefault(node_name, [0, 0, CIRCUIT_COOLDOWN])
+            if circuit[0] >= CIRCUIT_FAILURE_THRESHOLD:
+                # Half-open probe failed: back off further
+                circuit[2] = min(circuit[2] * 2, CIRCUIT_MAX_COOLDOWN)
+            circuit[0] += 1
+            if circuit[0] >= CIRCUIT_FAILURE_THRESHOLD:
+                circuit[1] = time.monotonic() + circuit[2]
+                logger.warning(f"Circuit for {node_name} open for {circuit[2]}s after {circuit[0]} failures")
+    
+    def _node_write(self, write, node_name, *args):
+        """
+        Run db.execute_query(_returning) on node_name through its circuit breaker.
+        
+        Title writes have a fixed set of statement shapes, so they always run
+        as per-session prepared statements.
+        """
+        if self._circuit_open(node_name):
+            return {'success': False, 'error': f'{node_name} unavailable (circuit open)'}
+        
+        result = write(node_name, *args, prepared=True)
+        # No errno on a failure means no connection could be checked out at all
+        errno = result.get('errno')
+        self._record_reachability(
+            node_name, result['success'] or (errno is not None and errno not in CONNECTION_ERRNOS)
+        )
+        return result
+    
+    def _get_title_type(self, tconst):
+        """title_type a write to tconst is routed by (cached), or None if the title isn't found"""
+        with self._title_types_lock:
+            title_type = self._title_types.get(tconst)
+        if title_type:
+            return title_type
+        
+        title = self.db.get_title_by_id(tconst)
+        if 'error' in title:
+            return None
+        
+        with self._title_types_lock:
+            self._title_types[tconst] = title['title_type']
+        return title['title_type']
+    
+    def _forget_title_type(self, tconst):
+        """Drop a cached route before a write that deletes the title or changes its type"""
+        with self._title_types_lock:
+            self._title_types.pop(tconst, None)
+    
+    def _last_updated(self, result, tconst):
+        """last_updated of the row a write just touched, or None if it can't be found"""
+        row = result.get('row')
+        if row:
+            return row['last_updated']
+        
+        # Write matched no row on that node; fall back to wherever the title lives
+        record = self.db.get_title_by_id(tconst)
+        return None if 'error' in record else record.get('last_updated')
+
+    def _replicate_to_central(self, operation_type, primary_node, record_id, query, params, results,
+                              result_central=None, isolation_level='READ COMMITTED', durability_mode='sync'):
+        """
+        Second half of a write that committed on its primary fragment: apply it to
+        central (unless result_central already holds that outcome, or durability_mode
+        is 'async') and log the replication.
+        
+        A central write that fails or is deferred is logged PENDING for the retry
+        loop, so the operation still succeeds. Returns the API response.
+        """
+        central_node = CENTRAL_NODE
+        deferred = durability_mode == 'async'
+        
+        if not deferred:
+            if result_central is None:
+                result_central = self._node_write(self.db.execute_query, central_node, query, params, isolation_level)
+            results[central_node] = result_central
+        replicated = not deferred and result_central['success']
+        
+        if replicated:
+            # The SUCCESS row is an audit record only (both nodes already hold the
+            # write), so it's written off the request thread. A crash can lose
+            # it, but never data: only PENDING rows drive recovery.
+            self._replica_pool.submit(
+                self.transaction_logger.log_replication,
+                source_node=primary_node,
+                target_node=central_node,
+                operation_type=operation_type,
+                record_id=record_id,
+                query=query,  # Log the replication query, not the original
+                params=params,
+                status='SUCCESS'
+            )
+            logger.info(f"✓ {operation_type} replicated to CENTRAL {central_node} for {record_id}")
+            return {
+                'success': True,
+                'primary_node': primary_node,
+                'replicated_to': central_node,
+                'results': results,
+                'message': f'{operation_type.capitalize()} committed to {primary_node} and replicated to {central_node}'
+            }
+        
+        # PENDING rows stay synchronous: the retry loop depends on them
+        transaction_id = self.transaction_logger.log_replication(
+            source_node=primary_node,
+            target_node=central_node,
+            operation_type=operation_type,
+            record_id=record_id,
+            query=query,
+            params=params,
+            status='PENDING',
+            error_msg=None if deferred else result_central.get('error')
+        )
+        
+        if deferred:
+            logger.info(f"{operation_type} replication to {central_node} deferred for {record_id}")
+        else:
+            logger.warning(
+                f"⚠ {operation_type} REPLICATION FAILED: {primary_node} → {central_node} for {record_id}. Queued."
+            )
+        return {
+            'success': True,
+            'primary_node': primary_node,
+            'replicated_to': None,
+            'pending_replication': central_node,
+            'transaction_id': transaction_id,
+            'results': results,
+            'message': (
+                f'{operation_type.capitalize()} committed to {primary_node}. '
+                f'Replication to {central_node} {"deferred" if deferred else "queued"}.'
+            )
+        }
+    
+    def _queue_for_fragment(self, operation_type, primary_node, record_id, query, params, results, reason):
+        """
+        Log a write that fell back to central as PENDING for its fragment.
+        
+        Returns the API response (primary_node reports central, where it committed).
+        """
+        central_node = CENTRAL_NODE
+        transaction_id = self.transaction_logger.log_replication(
+            source_node=central_node,
+            target_node=primary_node,
+            operation_type=operation_type,
+            record_id=record_id,
+            query=query,
+            params=params,
+            status='PENDING',
+            error_msg=reason
+        )
+        
+        logger.info(
+            f"✓ {operation_type} to CENTRAL (fallback) succeeded for {record_id}. Queued for {primary_node}."
+        )
+        return {
+            'success': True,
+            'primary_node': central_node,
+            'replicated_to': None,
+            'pending_replication': primary_node,
+            'transaction_id': transaction_id,
+            'results': results,
+            'message': f'{operation_type.capitalize()} committed to {central_node} (fallback). Queued for {primary_node}.'
+        }
 
     def _get_new_tconst_transactional(self, conn):
         """
@@ -51,7 +319,7 @@ class ReplicationManager:
             logger.error(f"Error generating tconst: {e}")
             raise Exception(f"Failed to generate new tconst: {e}")
 
-    def insert_title(self, data):
+    def insert_title(self, data, durability_mode='sync'):
         """
         IMPROVED Insert flow with atomic ID generation:
         
@@ -69,12 +337,24 @@ class ReplicationManager:
         - ID collisions
         - Orphaned IDs (generated but not used)
         - Race conditions
+        
+        Only 'sync' durability is accepted (see INSERT_DURABILITY_MODES).
         """
+        if durability_mode not in INSERT_DURABILITY_MODES:
+            return {
+                'success': False,
+                'error': f'Durability mode {durability_mode!r} is not supported for inserts'
+            }
+        
         title_type = data.get('title_type')
         primary_node = self._get_primary_node(title_type)
-        central_node = 'node1'
+        central_node = CENTRAL_NODE
         
-        primary_available = self.db.check_node(primary_node)
+        if self._circuit_open(primary_node):
+            primary_available = False
+        else:
+            primary_available = self.db.check_node(primary_node)
+            self._record_reachability(primary_node, primary_available)
         
         if primary_available:
             # === CASE A: Primary fragment is UP ===
@@ -88,10 +368,7 @@ class ReplicationManager:
                 }
             
             # Insert to primary fragment (MySQL sets last_updated automatically)
-            query = """
-                INSERT INTO titles (tconst, title_type, primary_title, start_year, runtime_minutes, genres)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
+            query = INSERT_TITLE_QUERY
             params = (
                 tconst,
                 title_type,
@@ -102,120 +379,49 @@ class ReplicationManager:
             )
             
             results = {}
-            result_primary = self.db.execute_query(primary_node, query, params)
+            result_primary = self._node_write(
+                self.db.execute_query_returning, primary_node, query, params, LAST_UPDATED_QUERY, (tconst,)
+            )
             results[primary_node] = result_primary
             
             if result_primary['success']:
                 logger.info(f"✓ INSERT to PRIMARY {primary_node} succeeded for {tconst}")
                 
-                # Fetch the record with its timestamp
-                record = self.db.get_title_by_id(tconst)
-                if 'error' in record:
+                # Timestamp was read back in the insert's own transaction
+                last_updated = self._last_updated(result_primary, tconst)
+                if last_updated is None:
                     logger.error(f"✗ Failed to fetch inserted record {tconst}")
                     return {
                         'success': False,
                         'error': 'Insert succeeded but failed to fetch record for replication'
                     }
                 
-                last_updated = record.get('last_updated')
-                
                 # Replicate to central WITH explicit timestamp
-                replication_query = """
-                    INSERT INTO titles 
-                    (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                replication_params = params + (last_updated,)
-                
-                result_central = self.db.execute_query(central_node, replication_query, replication_params)
-                results[central_node] = result_central
-                
-                if result_central['success']:
-                    self.transaction_logger.log_replication(
-                        source_node=primary_node,
-                        target_node=central_node,
-                        operation_type='INSERT',
-                        record_id=tconst,
-                        query=replication_query,  # Log the replication query, not the original
-                        params=replication_params,
-                        status='SUCCESS'
-                    )
-                    logger.info(f"✓ INSERT replicated to CENTRAL for {tconst}")
-                    
-                    return {
-                        'success': True,
-                        'tconst': tconst,
-                        'primary_node': primary_node,
-                        'replicated_to': central_node,
-                        'results': results,
-                        'message': f'Insert committed to {primary_node} and replicated to {central_node}'
-                    }
-                else:
-                    # Central replication failed - queue for retry
-                    transaction_id = self.transaction_logger.log_replication(
-                        source_node=primary_node,
-                        target_node=central_node,
-                        operation_type='INSERT',
-                        record_id=tconst,
-                        query=replication_query,
-                        params=replication_params,
-                        status='PENDING',
-                        error_msg=result_central.get('error')
-                    )
-                    
-                    logger.warning(f"⚠ REPLICATION FAILED: {primary_node} → {central_node} for {tconst}. Queued.")
-                    
-                    return {
-                        'success': True,
-                        'tconst': tconst,
-                        'primary_node': primary_node,
-                        'replicated_to': None,
-                        'pending_replication': central_node,
-                        'transaction_id': transaction_id,
-                        'results': results,
-                        'message': f'Insert committed to {primary_node}. Replication to {central_node} queued.'
-                    }
+                response = self._replicate_to_central(
+                    'INSERT', primary_node, tconst, REPLICATE_INSERT_QUERY, params + (last_updated,), results
+                )
+                response['tconst'] = tconst
+                return response
             else:
                 # Primary insert failed - try central as fallback
                 logger.error(f"✗ INSERT to PRIMARY {primary_node} failed for {tconst}: {result_primary.get('error')}")
                 logger.warning(f"⚠ Attempting central as fallback for {tconst}")
                 
-                result_central = self.db.execute_query(central_node, query, params)
+                result_central = self._node_write(
+                    self.db.execute_query_returning, central_node, query, params, LAST_UPDATED_QUERY, (tconst,)
+                )
                 results[central_node] = result_central
                 
                 if result_central['success']:
-                    # Fetch record from central to get timestamp
-                    record = self.db.get_title_by_id(tconst)
-                    last_updated = record.get('last_updated')
-                    
-                    replication_query = """
-                        INSERT INTO titles 
-                        (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                    """
-                    replication_params = params + (last_updated,)
+                    # Timestamp read back from central in the same transaction
+                    last_updated = self._last_updated(result_central, tconst)
                     
-                    transaction_id = self.transaction_logger.log_replication(
-                        source_node=central_node,
-                        target_node=primary_node,
-                        operation_type='INSERT',
-                        record_id=tconst,
-                        query=replication_query,
-                        params=replication_params,
-                        status='PENDING',
-                        error_msg=f'{primary_node} insert failed: {result_primary.get("error")}'
+                    response = self._queue_for_fragment(
+                        'INSERT', primary_node, tconst, REPLICATE_INSERT_QUERY, params + (last_updated,),
+                        results, f'{primary_node} insert failed: {result_primary.get("error")}'
                     )
-                    
-                    return {
-                        'success': True,
-                        'tconst': tconst,
-                        'primary_node': central_node,
-                        'replicated_to': None,
-                        'pending_replication': primary_node,
-                        'transaction_id': transaction_id,
-                        'results': results,
-                        'message': f'Insert committed to {central_node} (fallback). Queued for {primary_node}.'
-                    }
+                    response['tconst'] = tconst
+                    return response
                 else:
                     return {
                         'success': False,
@@ -241,10 +447,7 @@ class ReplicationManager:
                 conn.start_transaction()
                 tconst = self._get_new_tconst_transactional(conn)
                 
-                query = """
-                    INSERT INTO titles (tconst, title_type, primary_title, start_year, runtime_minutes, genres)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """
+                query = INSERT_TITLE_QUERY
                 params = (
                     tconst,
                     title_type,
@@ -267,36 +470,13 @@ class ReplicationManager:
                 logger.info(f"✓ ATOMIC INSERT to CENTRAL (fallback) succeeded for {tconst}")
                 
                 # Queue replication WITH timestamp
-                replication_query = """
-                    INSERT INTO titles 
-                    (tconst, title_type, primary_title, start_year, runtime_minutes, genres, last_updated)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """
-                replication_params = params + (last_updated,)
-                
-                transaction_id = self.transaction_logger.log_replication(
-                    source_node=central_node,
-                    target_node=primary_node,
-                    operation_type='INSERT',
-                    record_id=tconst,
-                    query=replication_query,
-                    params=replication_params,
-                    status='PENDING',
-                    error_msg=f'{primary_node} was unavailable during insert'
+                response = self._queue_for_fragment(
+                    'INSERT', primary_node, tconst, REPLICATE_INSERT_QUERY, params + (last_updated,),
+                    {central_node: {'success': True, 'method': 'atomic_insert_with_id_generation'}},
+                    f'{primary_node} was unavailable during insert'
                 )
-                
-                return {
-                    'success': True,
-                    'tconst': tconst,
-                    'primary_node': central_node,
-                    'replicated_to': None,
-                    'pending_replication': primary_node,
-                    'transaction_id': transaction_id,
-                    'results': {
-                        central_node: {'success': True, 'method': 'atomic_insert_with_id_generation'}
-                    },
-                    'message': f'Atomic insert to {central_node} (fallback). Queued for {primary_node}.'
-                }
+                response['tconst'] = tconst
+                return response
                 
             except Exception as e:
                 conn.rollback()
@@ -318,7 +498,7 @@ class ReplicationManager:
         For atomic operations, use _get_new_tconst_transactional() instead.
         """
         # Try central first (has all data)
-        central_node = 'node1'
+        central_node = CENTRAL_NODE
         conn = self.db.get_connection(central_node, 'SERIALIZABLE')
         
         if conn:
@@ -392,159 +572,76 @@ class ReplicationManager:
         
         raise Exception("Cannot generate tconst: no nodes available")
     
-    def update_title(self, tconst, data, isolation_level='READ COMMITTED'):
-        """Update title with bidirectional replication support"""
-        title = self.db.get_title_by_id(tconst)
+    def update_title(self, tconst, data, isolation_level='READ COMMITTED', durability_mode='sync'):
+        """Update title with bidirectional replication support (durability_mode: see DURABILITY_MODES)"""
+        # Reject unknown columns before any round trip (names are interpolated into the UPDATE)
+        columns = tuple(sorted(key for key in data if key != 'tconst'))
+        invalid = [column for column in columns if column not in UPDATABLE_COLUMNS]
+        if invalid or not columns:
+            return {'success': False, 'error': f'Invalid update fields: {invalid or "none given"}'}
         
-        if 'error' in title:
+        title_type = self._get_title_type(tconst)
+        
+        if title_type is None:
             return {'success': False, 'error': 'Title not found'}
         
-        title_type = title['title_type']
         primary_node = self._get_primary_node(title_type)
-        central_node = 'node1'
+        central_node = CENTRAL_NODE
         
-        # Build UPDATE query (without last_updated - let MySQL set it)
-        set_clauses = []
-        params = []
-        
-        for key, value in data.items():
-            if key != 'tconst':
-                set_clauses.append(f"{key} = %s")
-                params.append(value)
+        if 'title_type' in columns:
+            self._forget_title_type(tconst)
         
-        params.append(tconst)
-        query = f"UPDATE titles SET {', '.join(set_clauses)} WHERE tconst = %s"
+        # Build UPDATE query (without last_updated - let MySQL set it)
+        values = tuple(data[column] for column in columns)
+        params = values + (tconst,)
+        query = _update_query(columns)
         
         results = {}
         
         # Try primary fragment first
-        result_primary = self.db.execute_query(primary_node, query, tuple(params), isolation_level)
+        result_primary = self._node_write(
+            self.db.execute_query_returning, primary_node, query, params,
+            LAST_UPDATED_QUERY, (tconst,), isolation_level
+        )
         results[primary_node] = result_primary
         
         if result_primary['success']:
             logger.info(f"✓ UPDATE to PRIMARY {primary_node} succeeded for {tconst}")
             
-            # Fetch updated record with new timestamp
-            updated_record = self.db.get_title_by_id(tconst)
-            if 'error' in updated_record:
+            # New timestamp read back from the primary in the update's own transaction
+            last_updated = self._last_updated(result_primary, tconst)
+            if last_updated is None:
                 logger.error(f"✗ Failed to fetch updated record {tconst}")
                 return {
                     'success': False,
                     'error': 'Update succeeded but failed to fetch record for replication'
                 }
             
-            last_updated = updated_record.get('last_updated')
-            
-            # Build replication query WITH explicit timestamp
-            replication_set_clauses = []
-            replication_params = []
-            
-            for key, value in data.items():
-                if key != 'tconst':
-                    replication_set_clauses.append(f"{key} = %s")
-                    replication_params.append(value)
-            
-            # Add last_updated to SET clause
-            replication_set_clauses.append("last_updated = %s")
-            replication_params.append(last_updated)
-            replication_params.append(tconst)
-            
-            replication_query = f"UPDATE titles SET {', '.join(replication_set_clauses)} WHERE tconst = %s"
-            
-            result_central = self.db.execute_query(central_node, replication_query, tuple(replication_params), isolation_level)
-            results[central_node] = result_central
-            
-            if result_central['success']:
-                self.transaction_logger.log_replication(
-                    source_node=primary_node,
-                    target_node=central_node,
-                    operation_type='UPDATE',
-                    record_id=tconst,
-                    query=replication_query,
-                    params=tuple(replication_params),
-                    status='SUCCESS'
-                )
-                logger.info(f"✓ UPDATE replicated to CENTRAL {central_node} for {tconst}")
-                
-                return {
-                    'success': True,
-                    'primary_node': primary_node,
-                    'replicated_to': central_node,
-                    'results': results,
-                    'message': f'Update committed and replicated'
-                }
-            else:
-                transaction_id = self.transaction_logger.log_replication(
-                    source_node=primary_node,
-                    target_node=central_node,
-                    operation_type='UPDATE',
-                    record_id=tconst,
-                    query=replication_query,
-                    params=tuple(replication_params),
-                    status='PENDING',
-                    error_msg=result_central.get('error')
-                )
-                
-                logger.warning(f"⚠ UPDATE REPLICATION FAILED for {tconst}. Queued.")
-                
-                return {
-                    'success': True,
-                    'primary_node': primary_node,
-                    'replicated_to': None,
-                    'pending_replication': central_node,
-                    'transaction_id': transaction_id,
-                    'results': results,
-                    'message': f'Update committed to {primary_node}, replication queued'
-                }
+            # Replicate WITH explicit timestamp
+            return self._replicate_to_central(
+                'UPDATE', primary_node, tconst, _update_query(columns, with_timestamp=True),
+                values + (last_updated, tconst, last_updated), results,
+                isolation_level=isolation_level, durability_mode=durability_mode
+            )
         else:
             # Fragment down - try central as fallback
             logger.warning(f"⚠ PRIMARY {primary_node} unavailable, using central as fallback for {tconst}")
             
-            result_central = self.db.execute_query(central_node, query, tuple(params), isolation_level)
+            result_central = self._node_write(
+                self.db.execute_query_returning, central_node, query, params,
+                LAST_UPDATED_QUERY, (tconst,), isolation_level
+            )
             results[central_node] = result_central
             
             if result_central['success']:
-                # Fetch updated record from central
-                updated_record = self.db.get_title_by_id(tconst)
-                last_updated = updated_record.get('last_updated')
-                
-                # Build replication query with timestamp
-                replication_set_clauses = []
-                replication_params = []
-                
-                for key, value in data.items():
-                    if key != 'tconst':
-                        replication_set_clauses.append(f"{key} = %s")
-                        replication_params.append(value)
-                
-                replication_set_clauses.append("last_updated = %s")
-                replication_params.append(last_updated)
-                replication_params.append(tconst)
+                # New timestamp read back from central in the update's own transaction
+                last_updated = self._last_updated(result_central, tconst)
                 
-                replication_query = f"UPDATE titles SET {', '.join(replication_set_clauses)} WHERE tconst = %s"
-                
-                transaction_id = self.transaction_logger.log_replication(
-                    source_node=central_node,
-                    target_node=primary_node,
-                    operation_type='UPDATE',
-                    record_id=tconst,
-                    query=replication_query,
-                    params=tuple(replication_params),
-                    status='PENDING',
-                    error_msg=f'{primary_node} was unavailable'
+                # Queue replication with timestamp
+                return self._queue_for_fragment(
+                    'UPDATE', primary_node, tconst, _update_query(columns, with_timestamp=True),
+                    values + (last_updated, tconst, last_updated), results, f'{primary_node} was unavailable'
                 )
-                
-                logger.info(f"✓ UPDATE to CENTRAL (fallback) succeeded for {tconst}. Queued for {primary_node}.")
-                
-                return {
-                    'success': True,
-                    'primary_node': central_node,
-                    'replicated_to': None,
-                    'pending_replication': primary_node,
-                    'transaction_id': transaction_id,
-                    'results': results,
-                    'message': f'Update committed to {central_node} (fallback). Queued for {primary_node}.'
-                }
             else:
                 logger.error(f"✗ BOTH NODES FAILED for UPDATE {tconst}")
                 return {
@@ -553,104 +650,56 @@ class ReplicationManager:
                     'results': results
                 }
     
-    def delete_title(self, tconst):
-        """Delete title with bidirectional replication support"""
-        title = self.db.get_title_by_id(tconst)
+    def delete_title(self, tconst, durability_mode='sync'):
+        """Delete title with bidirectional replication support (durability_mode: see DURABILITY_MODES)"""
+        title_type = self._get_title_type(tconst)
         
-        if 'error' in title:
+        if title_type is None:
             return {'success': False, 'error': 'Title not found'}
         
-        title_type = title['title_type']
         primary_node = self._get_primary_node(title_type)
-        central_node = 'node1'
+        central_node = CENTRAL_NODE
+        self._forget_title_type(tconst)
         
-        query = "DELETE FROM titles WHERE tconst = %s"
+        query = DELETE_TITLE_QUERY
         params = (tconst,)
         
         results = {}
         
-        # Try primary fragment first
-        result_primary = self.db.execute_query(primary_node, query, params)
+        if durability_mode == 'async':
+            # Central is only written here if the primary fails (fallback below)
+            result_primary = self._node_write(self.db.execute_query, primary_node, query, params)
+            result_central = (
+                None if result_primary['success']
+                else self._node_write(self.db.execute_query, central_node, query, params)
+            )
+        else:
+            # A delete carries no primary-set timestamp, so central doesn't have to
+            # wait for the primary: both run at once and the outcomes are matched up after
+            future_central = self._replica_pool.submit(
+                self._node_write, self.db.execute_query, central_node, query, params
+            )
+            result_primary = self._node_write(self.db.execute_query, primary_node, query, params)
+            result_central = future_central.result()
         results[primary_node] = result_primary
         
         if result_primary['success']:
             logger.info(f"✓ DELETE from PRIMARY {primary_node} succeeded for {tconst}")
             
-            result_central = self.db.execute_query(central_node, query, params)
-            results[central_node] = result_central
-            
-            if result_central['success']:
-                self.transaction_logger.log_replication(
-                    source_node=primary_node,
-                    target_node=central_node,
-                    operation_type='DELETE',
-                    record_id=tconst,
-                    query=query,
-                    params=params,
-                    status='SUCCESS'
-                )
-                logger.info(f"✓ DELETE replicated to CENTRAL {central_node} for {tconst}")
-                
-                return {
-                    'success': True,
-                    'primary_node': primary_node,
-                    'replicated_to': central_node,
-                    'results': results,
-                    'message': f'Delete committed and replicated'
-                }
-            else:
-                transaction_id = self.transaction_logger.log_replication(
-                    source_node=primary_node,
-                    target_node=central_node,
-                    operation_type='DELETE',
-                    record_id=tconst,
-                    query=query,
-                    params=params,
-                    status='PENDING',
-                    error_msg=result_central.get('error')
-                )
-                
-                logger.warning(f"⚠ DELETE REPLICATION FAILED for {tconst}. Queued.")
-                
-                return {
-                    'success': True,
-                    'primary_node': primary_node,
-                    'replicated_to': None,
-                    'pending_replication': central_node,
-                    'transaction_id': transaction_id,
-                    'results': results,
-                    'message': f'Delete committed to {primary_node}, replication queued'
-                }
+            return self._replicate_to_central(
+                'DELETE', primary_node, tconst, query, params, results,
+                result_central=result_central, durability_mode=durability_mode
+            )
         else:
-            # Fragment down - try central as fallback
+            # Fragment down - central (already applied above) is the fallback
             logger.warning(f"⚠ PRIMARY {primary_node} unavailable, using central as fallback for {tconst}")
             
-            result_central = self.db.execute_query(central_node, query, params)
             results[central_node] = result_central
             
             if result_central['success']:
-                transaction_id = self.transaction_logger.log_replication(
-                    source_node=central_node,
-                    target_node=primary_node,
-                    operation_type='DELETE',
-                    record_id=tconst,
-                    query=query,
-                    params=params,
-                    status='PENDING',
-                    error_msg=f'{primary_node} was unavailable'
+                return self._queue_for_fragment(
+                    'DELETE', primary_node, tconst, query, params, results, f'{primary_node} was unavailable'
                 )
-                
-                logger.info(f"✓ DELETE from CENTRAL (fallback) succeeded for {tconst}. Queued for {primary_node}.")
-                
-                return {
-                    'success': True,
-                    'primary_node': central_node,
-                    'replicated_to': None,
-                    'pending_replication': primary_node,
-                    'transaction_id': transaction_id,
-                    'results': results,
-                    'message': f'Delete committed to {central_node} (fallback). Queued for {primary_node}.'
-                }
             else:
                 logger.error(f"✗ BOTH NODES FAILED for DELETE {tconst}")
                 return {
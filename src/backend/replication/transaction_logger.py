@@ -7,6 +7,8 @@ logger = logging.getLogger(__name__)
 class TransactionLogger:
     def __init__(self, db_manager):
         self.db = db_manager
+        # Called after a PENDING entry is logged (set by ReplicationManager)
+        self.on_pending = None
     
     def log_replication(self, source_node, target_node, operation_type, 
                        record_id, query, params, status='PENDING', error_msg=None):
@@ -85,51 +87,64 @@ class TransactionLogger:
             f"Logged {operation_type} for {record_id}: "
             f"{source_node} → {target_node} (status: {status})"
         )
+        if status == 'PENDING' and self.on_pending:
+            self.on_pending()
         return transaction_id
     
-    def update_log_status(self, node, transaction_id, status, error_msg=None):
+    def mark_replicated(self, node, transaction_ids):
         """
-        Update status of a logged transaction.
+        Mark a batch of replayed transactions as SUCCESS in one statement.
         
         Args:
-            node: The node where the log entry exists
-            transaction_id: Transaction ID to update
-            status: New status (SUCCESS/FAILED/PENDING)
-            error_msg: Optional error message
+            node: The node where the log entries exist
+            transaction_ids: Transaction IDs that were replicated
         """
-        query = """
+        placeholders = ', '.join(['%s'] * len(transaction_ids))
+        query = f"""
             UPDATE transaction_log 
-            SET status = %s, 
-                error_message = %s,
+            SET status = 'SUCCESS', 
+                error_message = NULL,
+                retry_count = retry_count + 1,
                 completed_at = NOW(),
                 last_retry_at = NOW()
-            WHERE transaction_id = %s
+            WHERE transaction_id IN ({placeholders})
         """
         
-        result = self.db.execute_query(node, query, (status, error_msg, transaction_id))
+        result = self.db.execute_query(node, query, tuple(transaction_ids))
         
         if result['success']:
-            logger.info(f"✓ Updated transaction {transaction_id} to {status} on {node}")
+            logger.info(f"✓ Marked {len(transaction_ids)} transactions SUCCESS on {node}")
         else:
-            logger.error(f"✗ Failed to update transaction {transaction_id} on {node}")
+            logger.error(f"✗ Failed to mark {len(transaction_ids)} transactions on {node}")
         
         return result
     
-    def increment_retry_count(self, node, transaction_id):
+    def record_retry(self, node, transaction_id, status, error_msg=None):
         """
-        Increment retry counter for a pending transaction.
+        Count one retry attempt and set its outcome in a single UPDATE.
         
         Args:
             node: Node where the log entry exists
-            transaction_id: Transaction ID to update
+            transaction_id: Transaction ID that was retried
+            status: Outcome (SUCCESS/FAILED, or PENDING to retry again)
+            error_msg: Error from the attempt, if it failed
         """
         query = """
             UPDATE transaction_log 
             SET retry_count = retry_count + 1,
-                last_retry_at = NOW()
+                status = %s,
+                error_message = %s,
+                last_retry_at = NOW(),
+                completed_at = IF(%s = 'PENDING', completed_at, NOW())
             WHERE transaction_id = %s
         """
-        return self.db.execute_query(node, query, (transaction_id,))
+        
+        result = self.db.execute_query(node, query, (status, error_msg, status, transaction_id))
+        
+        if not result['success']:
+            logger.error(f"✗ Failed to record retry of {transaction_id} on {node}")
+        
+        return result
     
     def get_pending_replications(self, source_node):
         """